@@ -0,0 +1,128 @@
+"""Admin table export: worker memory and other requests' latency meanwhile.
+
+Seeds a throwaway SQLite database with --rows programs, starts uvicorn and
+downloads GET /admin/export/programs.csv (gzipped with --gzip) while another
+client keeps requesting GET /programs/{id}. Reports the export's time and
+size, the worker's peak RSS (VmHWM, Linux only) and the latency of the
+concurrent requests, which shouldn't wait for the export.
+
+    SQLITE_MMAP_SIZE=0 SQLITE_CACHE_SIZE=-2000 \\
+        ./blog-env/bin/python benchmarks/bench_admin_export.py --rows 1000000 --gzip
+
+Needs httpx (plus aiosqlite with --async).
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--rows", type=int, default=1000000)
+parser.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+parser.add_argument("--gzip", action="store_true")
+parser.add_argument("--port", type=int, default=8767)
+parser.add_argument("--async", dest="async_db", action="store_true", help="run with ASYNC_DB=true")
+
+
+def seed(path: str, rows: int) -> str:
+    # Returns an admin token
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    sys.path.insert(0, ROOT)
+    from blog import database, models, token
+
+    models.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+    admin = models.User(name="bench", email="bench@example.com", password="x", role="admin")
+    db.add(admin)
+    db.commit()
+    access_token = token.create_access_token(token.user_claims(admin))
+    db.close()
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO programs (name, description, start_date, end_date, user_id) VALUES (?, ?, ?, ?, 1)",
+        ((f"Program {i}", "x" * 200, "2026-01-01", "2026-12-31") for i in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+    return access_token
+
+
+def peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+async def measure(base_url: str, access_token: str, args):
+    latencies = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        async def export():
+            size = 0
+            start = time.perf_counter()
+            url = f"/admin/export/programs.{args.format}?gzip={str(args.gzip).lower()}"
+            async with client.stream("GET", url, headers={"Authorization": f"Bearer {access_token}"}) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_raw():
+                    size += len(chunk)
+            done.set()
+            return size, time.perf_counter() - start
+
+        async def ping():
+            while not done.is_set():
+                start = time.perf_counter()
+                (await client.get(f"/programs/{random.randint(1, args.rows)}")).raise_for_status()
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        (size, elapsed), _ = await asyncio.gather(export(), ping())
+    latencies.sort()
+    return size, elapsed, latencies
+
+
+def run(path: str, access_token: str, args):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", ASYNC_DB="true" if args.async_db else "false")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "blog.main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{base_url}/programs/?limit=1")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        idle_mb = peak_rss_mb(server.pid)
+        size, elapsed, latencies = asyncio.run(measure(base_url, access_token, args))
+        return size, elapsed, latencies, idle_mb, peak_rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/bench.db"
+        access_token = seed(path, args.rows)
+        size, elapsed, latencies, idle_mb, peak_mb = run(path, access_token, args)
+    print(f"{'ASYNC_DB=true' if args.async_db else 'ASYNC_DB=false'}, {args.rows} rows, "
+          f"{args.format}{' + gzip' if args.gzip else ''}")
+    print(f"export    {elapsed:6.2f} s  {size / 1e6:7.1f} MB  peak RSS {peak_mb:6.1f} MB (idle {idle_mb:.1f} MB)")
+    print(f"GET /programs/{{id}} meanwhile: {len(latencies)} requests  "
+          f"p50 {statistics.median(latencies) * 1000:6.1f} ms  max {latencies[-1] * 1000:6.1f} ms")
@@ -0,0 +1,108 @@
+"""Requests/second of the read routes with the sync vs async database layer.
+
+Seeds a throwaway SQLite database, starts uvicorn once with ASYNC_DB=false and
+once with ASYNC_DB=true, and hammers GET /programs/ and GET /programs/{id}
+with many concurrent clients.
+
+    ./blog-env/bin/python benchmarks/bench_async_db.py --concurrency 200
+
+Needs httpx and aiosqlite (plus asyncpg when --database-url is Postgres).
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--rows", type=int, default=2000)
+parser.add_argument("--requests", type=int, default=5000)
+parser.add_argument("--concurrency", type=int, default=200)
+parser.add_argument("--port", type=int, default=8765)
+parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+args = parser.parse_args()
+
+
+def seed(database_url: str):
+    os.environ["DATABASE_URL"] = database_url
+    sys.path.insert(0, ROOT)
+    from blog import database, models
+
+    models.Base.metadata.create_all(bind=database.engine)
+    db = database.SessionLocal()
+    if db.query(models.Program).count() >= args.rows:
+        return
+    user = models.User(name="bench", email=f"bench-{time.time()}@example.com", password="x", role="admin")
+    db.add(user)
+    db.commit()
+    db.add_all(
+        models.Program(name=f"Program {i}", description="x" * 200, start_date="2026-01-01",
+                       end_date="2026-12-31", user_id=user.id)
+        for i in range(args.rows)
+    )
+    db.commit()
+    db.close()
+
+
+async def hammer(base_url: str):
+    latencies = []
+    sem = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def one(i):
+            path = "/programs/?limit=20" if i % 2 else f"/programs/{random.randint(1, args.rows)}"
+            async with sem:
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": args.requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def run(mode: str, database_url: str):
+    env = dict(os.environ, DATABASE_URL=database_url, ASYNC_DB="true" if mode == "async" else "false")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "blog.main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{base_url}/programs/?limit=1")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        return asyncio.run(hammer(base_url))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{tmp}/bench.db"
+        seed(database_url)
+        print(f"{args.requests} requests, concurrency {args.concurrency}, {args.rows} rows")
+        for mode in ("sync", "async"):
+            result = run(mode, database_url)
+            print(f"{mode:5s}  {result['rps']:8.0f} req/s  p50 {result['p50_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms")
@@ -0,0 +1,99 @@
+"""JSON response cost per 1,000 rows: FastAPI's stock JSONResponse vs the app's default.
+
+Requests go through real routes (TestClient), so each case pays what the
+app's routes pay: FastAPI's serialize_response step (jsonable_encoder for
+routes without a response_model, the response_model's serializer otherwise)
+and then the response class's render. Two apps with the same routes:
+
+  * stock: FastAPI's default JSONResponse;
+  * app:   blog.responses.default_response_class (orjson render).
+
+and two routes on each:
+
+  * /dicts:  plain dicts, no response_model;
+  * /models: the same rows with response_model=List[schema.ProgramResponse].
+
+An /empty route gives the per-request overhead, which is subtracted.
+
+    ./blog-env/bin/python benchmarks/bench_json_response.py --rows 1000
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import fastapi
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from blog import schema
+from blog.responses import default_response_class, orjson
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--rows", type=int, default=1000)
+parser.add_argument("--repeat", type=int, default=200)
+
+
+def make_rows(count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": i,
+            "name": f"Program {i}",
+            "description": "x" * 200,
+            "start_date": "2026-01-01",
+            "end_date": "2026-12-31",
+            "image_url": None,
+            "price": Decimal("49.90"),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def make_app(rows, **kwargs) -> TestClient:
+    app = FastAPI(**kwargs)
+
+    @app.get("/empty")
+    def empty():
+        return []
+
+    @app.get("/dicts")
+    def dicts():
+        return rows
+
+    @app.get("/models", response_model=List[schema.ProgramResponse])
+    def models():
+        return rows
+
+    return TestClient(app)
+
+
+def best(client: TestClient, path: str, repeat: int) -> float:
+    return min(timeit.repeat(lambda: client.get(path), number=1, repeat=repeat))
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    if orjson is None:
+        sys.exit("orjson is not installed; FastJSONResponse would fall back to stdlib json")
+
+    rows = make_rows(args.rows)
+    clients = [
+        ("stock", make_app(rows)),
+        ("app", make_app(rows, default_response_class=default_response_class)),
+    ]
+    print(f"FastAPI {fastapi.__version__}; {args.rows} rows, best of {args.repeat}; "
+          f"ms per 1,000 rows, request overhead subtracted")
+    for name, client in clients:
+        overhead = best(client, "/empty", args.repeat)
+        for path in ("/dicts", "/models"):
+            seconds = best(client, path, args.repeat) - overhead
+            print(f"{name:6s} {path:8s} {seconds / args.rows * 1000 * 1000:8.3f}")
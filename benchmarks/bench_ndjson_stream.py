@@ -0,0 +1,110 @@
+"""Time to first byte and worker memory of a streamed NDJSON list.
+
+Seeds throwaway SQLite databases of increasing size, starts uvicorn on each
+and reads GET /programs/?stream=1 to the end. Reports time to first byte,
+total time and the worker's peak RSS (VmHWM, Linux only), which should stay
+flat as the table grows.
+
+    SQLITE_MMAP_SIZE=0 SQLITE_CACHE_SIZE=-2000 \
+        ./blog-env/bin/python benchmarks/bench_ndjson_stream.py --rows 10000 100000 500000
+
+SQLite's mmap and page cache (see database.SQLITE_PRAGMAS) count towards RSS
+and fill up as the file is read, so turn them down to see the worker's own
+memory.
+
+Needs httpx (plus aiosqlite with --async).
+"""
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 500000])
+parser.add_argument("--port", type=int, default=8766)
+parser.add_argument("--async", dest="async_db", action="store_true", help="run with ASYNC_DB=true")
+
+
+def seed(path: str, rows: int):
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    sys.path.insert(0, ROOT)
+    from sqlalchemy import create_engine
+    from blog import models
+
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO programs (name, description, start_date, end_date, user_id) VALUES (?, ?, ?, ?, 1)",
+        ((f"Program {i}", "x" * 200, "2026-01-01", "2026-12-31") for i in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def read_stream(client, url: str):
+    lines = 0
+    start = time.perf_counter()
+    first_byte = None
+    with client.stream("GET", url, timeout=600) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            lines += chunk.count(b"\n")
+    return lines, first_byte, time.perf_counter() - start
+
+
+def run(path: str, rows: int, args):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", ASYNC_DB="true" if args.async_db else "false")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "blog.main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{base_url}/programs/?limit=1")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        idle_mb = peak_rss_mb(server.pid)
+        with httpx.Client(base_url=base_url) as client:
+            # The first request in a worker pays for compiling the statement;
+            # warm up with a stream that starts past the last row
+            from blog.pagination import encode_cursor
+            read_stream(client, f"/programs/?stream=1&cursor={encode_cursor(rows)}")
+            return (*read_stream(client, "/programs/?stream=1"), idle_mb, peak_rss_mb(server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    print("ASYNC_DB=true" if args.async_db else "ASYNC_DB=false")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/bench.db"
+            seed(path, rows)
+            lines, ttfb, total, idle_mb, peak_mb = run(path, rows, args)
+            assert lines == rows, (lines, rows)
+            print(f"{rows:8d} rows  first byte {ttfb * 1000:6.1f} ms  total {total:6.2f} s  "
+                  f"peak RSS {peak_mb:6.1f} MB (idle {idle_mb:.1f} MB)")
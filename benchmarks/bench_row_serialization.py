@@ -0,0 +1,75 @@
+"""Per-row cost of a program list page: ORM + pydantic vs Core rows.
+
+Seeds a throwaway SQLite database with --rows programs and builds one page
+of all of them both ways, query included:
+
+  * ORM objects validated into schema.Page[ProgramResponse] and dumped to
+    JSON, which is what a response_model with from_attributes did;
+  * Core Row tuples mapped by repo.program.list_rows (serializers.RowSerializer)
+    and dumped with blog.responses.dumps.
+
+    ./blog-env/bin/python benchmarks/bench_row_serialization.py --rows 10000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--rows", type=int, default=10000)
+parser.add_argument("--repeat", type=int, default=20)
+
+
+def seed(path: str, rows: int):
+    from blog import database, models
+
+    models.Base.metadata.create_all(bind=database.engine)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO programs (name, description, start_date, end_date, user_id) VALUES (?, ?, ?, ?, 1)",
+        [(f"Program {i}", "x" * 200, "2026-01-01", "2026-12-31") for i in range(rows)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def main(args):
+    from blog import database, models, schema
+    from blog.pagination import paginate_rows
+    from blog.repo.program import list_rows
+    from blog.responses import dumps
+
+    page_model = schema.Page[schema.ProgramResponse]
+    db = database.SessionLocal()
+
+    def orm_pydantic():
+        items = db.query(models.Program).order_by(models.Program.id).limit(args.rows).all()
+        db.expunge_all()
+        return page_model.model_validate({"items": items, "next_cursor": None}).model_dump_json().encode()
+
+    def core_rows():
+        page = paginate_rows(list_rows.select(), models.Program.id, db, limit=args.rows)
+        return dumps(list_rows.page(page))
+
+    # Both paths must produce the same response body
+    assert orm_pydantic() == core_rows()
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for label, fn in (("ORM + pydantic", orm_pydantic), ("Core rows", core_rows)):
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"{label:15s} {best * 1000:8.1f} ms/page  {best / args.rows * 1e6:6.2f} us/row")
+    db.close()
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/bench.db"
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        sys.path.insert(0, ROOT)
+        seed(path, args.rows)
+        main(args)
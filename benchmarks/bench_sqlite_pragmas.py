@@ -0,0 +1,102 @@
+"""Mixed read/write throughput on SQLite with and without the pragma profile.
+
+Starts several processes (standing in for gunicorn workers) against one
+SQLite file. Each does --write-ratio inserts and otherwise reads a page of
+programs, for --seconds. Runs once with SQLITE_PRAGMAS=false (SQLite
+defaults) and once with the profile from blog/database.py.
+
+    ./blog-env/bin/python benchmarks/bench_sqlite_pragmas.py --workers 9
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count() * 2 + 1)
+parser.add_argument("--seconds", type=float, default=10)
+parser.add_argument("--write-ratio", type=float, default=0.2)
+parser.add_argument("--rows", type=int, default=5000)
+
+
+def worker(database_url, pragmas, seconds, write_ratio, results):
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["SQLITE_PRAGMAS"] = pragmas
+    sys.path.insert(0, ROOT)
+    from sqlalchemy import exc
+    from blog import database, models
+
+    reads = writes = errors = 0
+    db = database.SessionLocal()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            if random.random() < write_ratio:
+                db.add(models.Program(name="bench", description="x" * 200, start_date="2026-01-01",
+                                      end_date="2026-12-31", user_id=1))
+                db.commit()
+                writes += 1
+            else:
+                start = random.randint(0, 4000)
+                db.query(models.Program).filter(models.Program.id > start).order_by(models.Program.id).limit(20).all()
+                reads += 1
+        except exc.OperationalError:
+            db.rollback()
+            errors += 1
+    db.close()
+    results.put((reads, writes, errors))
+
+
+def run(database_url, pragmas, args):
+    # spawn so each worker imports blog.database with its own settings
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=worker, args=(database_url, pragmas, args.seconds, args.write_ratio, results))
+        for _ in range(args.workers)
+    ]
+    for proc in procs:
+        proc.start()
+    totals = [0, 0, 0]
+    for _ in procs:
+        for i, value in enumerate(results.get()):
+            totals[i] += value
+    for proc in procs:
+        proc.join()
+    return totals
+
+
+def seed(database_url, rows):
+    import sqlite3
+    from sqlalchemy import create_engine
+
+    sys.path.insert(0, ROOT)
+    from blog import models
+
+    engine = create_engine(database_url)
+    models.Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    conn = sqlite3.connect(database_url.removeprefix("sqlite:///"))
+    conn.executemany(
+        "INSERT INTO programs (name, description, start_date, end_date, user_id) VALUES (?, ?, ?, ?, 1)",
+        [(f"Program {i}", "x" * 200, "2026-01-01", "2026-12-31") for i in range(rows)],
+    )
+    conn.commit()
+    conn.close()
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    print(f"{args.workers} workers, {args.seconds:.0f}s, {args.write_ratio:.0%} writes")
+    for label, pragmas in (("defaults", "false"), ("profile", "true")):
+        with tempfile.TemporaryDirectory() as tmp:
+            database_url = f"sqlite:///{tmp}/bench.db"
+            seed(database_url, args.rows)
+            reads, writes, errors = run(database_url, pragmas, args)
+            print(f"{label:9s} reads/s {reads / args.seconds:9.0f}  writes/s {writes / args.seconds:7.0f}  "
+                  f"locked errors {errors}")
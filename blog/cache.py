@@ -0,0 +1,449 @@
+from collections import OrderedDict
+import asyncio
+import math
+import random
+import struct
+from threading import Lock
+from fastapi.concurrency import run_in_threadpool
+import logging
+import os
+import time
+from . import metrics, database, responses
+
+logger = logging.getLogger(__name__)
+
+# Serialized JSON bodies of the public catalog lists, keyed "<namespace>:<query>".
+# Repo writes call invalidate(namespace) after they commit.
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+
+# Homepage lists (/programs, /services): after the TTL an entry is served for
+# up to STALE_TTL more seconds while a background task refreshes it, and
+# XFetch starts that refresh early with a probability that grows as expiry
+# nears (beta > 1 refreshes earlier, 0 turns it off).
+HOMEPAGE_CACHE_STALE_TTL = float(os.getenv("HOMEPAGE_CACHE_STALE_TTL", "300"))
+HOMEPAGE_CACHE_XFETCH_BETA = float(os.getenv("HOMEPAGE_CACHE_XFETCH_BETA", "1.0"))
+
+# Shared tier behind the per-worker cache: "none" (per-worker only), "redis"
+# (Redis 7+), or "memory" (in-process stand-in for tests and single-process
+# installs).
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "none").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# With a shared tier, local copies live at most this long in case an
+# invalidation message is missed
+CACHE_LOCAL_TTL = float(os.getenv("CACHE_LOCAL_TTL", "5"))
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "empoweredge:cache:")
+INVALIDATION_CHANNEL = f"{CACHE_KEY_PREFIX}invalidate"
+
+# Single-flight: on a miss one caller per key recomputes and the rest wait for
+# its result. Within a worker they share a future; across workers the filler
+# holds a short lock in the shared tier while the others poll for the value.
+SINGLE_FLIGHT_LOCK_TTL = float(os.getenv("SINGLE_FLIGHT_LOCK_TTL", "5"))
+SINGLE_FLIGHT_POLL_INTERVAL = float(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL", "0.05"))
+
+
+class LocalCache:
+    # In-process LRU with a TTL per entry
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._invalidated_at: dict[str, float] = {}
+        self._lock = Lock()
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                metrics.inc("cache.evictions")
+
+    def invalidate(self, namespace: str):
+        prefix = f"{namespace}:"
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            self._invalidated_at[namespace] = time.monotonic()
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def invalidated_within(self, namespace: str, seconds: float) -> bool:
+        invalidated_at = self._invalidated_at.get(namespace)
+        return invalidated_at is not None and time.monotonic() - invalidated_at < seconds
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._invalidated_at.clear()
+
+
+class MemoryBackend(LocalCache):
+    # Stand-in for the Redis tier: same interface, invalidations delivered in-process
+
+    def __init__(self, max_entries: int):
+        super().__init__(max_entries)
+        self._subscribers = []
+        self._locks: dict[str, float] = {}
+
+    def acquire(self, key: str, ttl: float) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self._locks.get(key, 0) > now:
+                return False
+            self._locks[key] = now + ttl
+            return True
+
+    def release(self, key: str):
+        with self._lock:
+            self._locks.pop(key, None)
+
+    def publish(self, namespace: str):
+        for callback in list(self._subscribers):
+            callback(namespace)
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def close(self):
+        self._subscribers.clear()
+
+
+class RedisBackend:
+    # Shared tier. Each namespace keeps a set of its keys so invalidate()
+    # can drop them without SCAN, plus a generation counter.
+
+    def __init__(self, url: str, prefix: str = CACHE_KEY_PREFIX):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._pubsub_thread = None
+
+    def _index(self, namespace: str) -> str:
+        return f"{self.prefix}keys:{namespace}"
+
+    def generation(self, namespace: str) -> int:
+        return int(self.client.get(f"{self.prefix}gen:{namespace}") or 0)
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        namespace = key.split(":", 1)[0]
+        ttl_ms = max(1, int(ttl * 1000))
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, value, px=ttl_ms)
+        pipe.sadd(self._index(namespace), self.prefix + key)
+        # The index must outlive every key in it, so its TTL only ever grows:
+        # NX gives a fresh index its first TTL, GT extends it (Redis 7+)
+        pipe.pexpire(self._index(namespace), ttl_ms, nx=True)
+        pipe.pexpire(self._index(namespace), ttl_ms, gt=True)
+        pipe.execute()
+
+    def invalidate(self, namespace: str):
+        index = self._index(namespace)
+        keys = self.client.smembers(index)
+        pipe = self.client.pipeline()
+        pipe.incr(f"{self.prefix}gen:{namespace}")
+        if keys:
+            pipe.delete(*keys)
+        pipe.delete(index)
+        pipe.execute()
+
+    def acquire(self, key: str, ttl: float) -> bool:
+        return bool(self.client.set(f"{self.prefix}lock:{key}", os.getpid(), nx=True, px=max(1, int(ttl * 1000))))
+
+    def release(self, key: str):
+        # Not owner-checked: if the lock already expired and was re-taken, the
+        # worst case is one extra recompute
+        self.client.delete(f"{self.prefix}lock:{key}")
+
+    def publish(self, namespace: str):
+        self.client.publish(INVALIDATION_CHANNEL, namespace)
+
+    def subscribe(self, callback):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{INVALIDATION_CHANNEL: lambda message: callback(message["data"].decode("utf-8"))})
+        self._pubsub_thread = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def close(self):
+        if self._pubsub_thread is not None:
+            self._pubsub_thread.stop()
+            self._pubsub_thread = None
+
+
+class TieredCache:
+    # Per-worker LRU in front of an optional shared backend. Invalidations go
+    # to the shared tier and are broadcast so every worker drops its copies.
+
+    def __init__(self, local: LocalCache, shared=None, local_ttl: float = CACHE_LOCAL_TTL):
+        self.local = local
+        self.shared = shared
+        self.local_ttl = local_ttl
+
+    def _shared_call(self, method, *args, default=None):
+        # A shared-tier outage degrades to per-worker caching instead of failing requests
+        try:
+            return getattr(self.shared, method)(*args)
+        except Exception:
+            metrics.inc("cache.shared.errors")
+            logger.warning("Shared cache %s failed", method, exc_info=True)
+            return default
+
+    def generation(self, namespace: str):
+        if self.shared is None:
+            return self.local.generation(namespace)
+        return self.local.generation(namespace), self._shared_call("generation", namespace)
+
+    def get(self, key: str) -> bytes | None:
+        value = self.local.get(key)
+        if value is not None or self.shared is None:
+            return value
+        value = self._shared_call("get", key)
+        if value is not None:
+            metrics.inc("cache.shared.hits")
+            self.local.set(key, value, self.local_ttl)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        if self.shared is None:
+            self.local.set(key, value, ttl)
+            return
+        self.local.set(key, value, min(ttl, self.local_ttl))
+        self._shared_call("set", key, value, ttl)
+
+    def acquire(self, key: str, ttl: float) -> bool:
+        # Without a shared tier the per-worker single-flight is all there is
+        if self.shared is None:
+            return True
+        return self._shared_call("acquire", key, ttl, default=True)
+
+    def release(self, key: str):
+        if self.shared is not None:
+            self._shared_call("release", key)
+
+    def invalidate(self, namespace: str):
+        self.local.invalidate(namespace)
+        if self.shared is not None:
+            self._shared_call("invalidate", namespace)
+            self._shared_call("publish", namespace)
+
+    def start(self):
+        if self.shared is not None:
+            self._shared_call("subscribe", self.local.invalidate)
+
+    def stop(self):
+        if self.shared is not None:
+            self._shared_call("close")
+
+    def clear(self):
+        self.local.clear()
+
+
+def build_cache() -> TieredCache:
+    local = LocalCache(RESPONSE_CACHE_MAX_ENTRIES)
+    if CACHE_BACKEND == "redis":
+        return TieredCache(local, RedisBackend(REDIS_URL))
+    if CACHE_BACKEND == "memory":
+        return TieredCache(local, MemoryBackend(RESPONSE_CACHE_MAX_ENTRIES))
+    return TieredCache(local)
+
+
+response_cache = build_cache()
+
+
+async def _blocking(func, *args):
+    # Shared-tier calls do network I/O, so keep them off the event loop
+    if response_cache.shared is None:
+        return func(*args)
+    return await run_in_threadpool(func, *args)
+
+
+# Responses assembled from several namespaces; dropped along with any of them
+BUNDLES = {
+    "home": ("programs", "services", "events", "blog"),
+}
+
+
+def invalidate(*namespaces: str):
+    for namespace in namespaces:
+        response_cache.invalidate(namespace)
+        for bundle, parts in BUNDLES.items():
+            if namespace in parts:
+                response_cache.invalidate(bundle)
+
+
+# Stored entries are prefixed with when they stop being fresh (wall clock, so
+# it holds across workers) and how long they took to compute, for XFetch
+_HEADER = struct.Struct("!dd")
+
+
+def _pack(value: bytes, ttl: float, delta: float) -> bytes:
+    return _HEADER.pack(time.time() + ttl, delta) + value
+
+
+def _unpack(entry: bytes) -> tuple[float, float, bytes]:
+    fresh_until, delta = _HEADER.unpack_from(entry)
+    return fresh_until, delta, entry[_HEADER.size:]
+
+
+def _early_refresh(fresh_until: float, delta: float, beta: float) -> bool:
+    # XFetch: -log(random()) is exponentially distributed, so slow-to-compute
+    # entries start refreshing earlier
+    return beta > 0 and time.time() - delta * beta * math.log(1.0 - random.random()) >= fresh_until
+
+
+def _replica_may_lag(namespace: str) -> bool:
+    # Fills read the replica. Right after a write (seen here directly or via
+    # the broadcast) it may not have the write yet, so don't store what it
+    # returns: the stale result would outlive the lag by a whole TTL.
+    return bool(database.READ_DATABASE_URL) and response_cache.local.invalidated_within(
+        namespace, database.REPLICA_LAG_SECONDS)
+
+
+_inflight: dict[str, asyncio.Future] = {}
+_background: set[asyncio.Task] = set()
+
+
+async def _fill(namespace: str, cache_key: str, producer, ttl: float, stale_ttl: float) -> bytes:
+    locked = await _blocking(response_cache.acquire, cache_key, SINGLE_FLIGHT_LOCK_TTL)
+    while not locked:
+        # Another worker is filling this key: wait for its value, or take over
+        # once its lock is released or expires
+        await asyncio.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+        entry = await _blocking(response_cache.get, cache_key)
+        if entry is not None:
+            fresh_until, _, value = _unpack(entry)
+            if fresh_until > time.time():
+                metrics.inc("cache.coalesced")
+                return value
+        locked = await _blocking(response_cache.acquire, cache_key, SINGLE_FLIGHT_LOCK_TTL)
+
+    try:
+        generation = await _blocking(response_cache.generation, namespace)
+        start = time.perf_counter()
+        value = await producer()
+        entry = _pack(value, ttl, time.perf_counter() - start)
+        # Don't store a result that a write invalidated while we were producing it
+        if await _blocking(response_cache.generation, namespace) == generation and not _replica_may_lag(namespace):
+            await _blocking(response_cache.set, cache_key, entry, ttl + stale_ttl)
+        return value
+    finally:
+        await _blocking(response_cache.release, cache_key)
+
+
+def _start_flight(cache_key: str) -> asyncio.Future:
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    return future
+
+
+async def _lead(future: asyncio.Future, namespace: str, cache_key: str, producer, ttl: float, stale_ttl: float) -> bytes:
+    try:
+        value = await _fill(namespace, cache_key, producer, ttl, stale_ttl)
+        future.set_result(value)
+        return value
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        # Waiters get the same error; mark it retrieved in case there are none
+        future.set_exception(exc)
+        future.exception()
+        raise
+    finally:
+        del _inflight[cache_key]
+
+
+def _refresh_done(task: asyncio.Task):
+    _background.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        metrics.inc("cache.refresh_errors")
+        logger.warning("Background cache refresh failed", exc_info=task.exception())
+
+
+def _refresh_in_background(namespace: str, cache_key: str, refresher, ttl: float, stale_ttl: float):
+    if cache_key in _inflight:
+        return
+    metrics.inc("cache.refreshes")
+    task = asyncio.create_task(_lead(_start_flight(cache_key), namespace, cache_key, refresher, ttl, stale_ttl))
+    _background.add(task)
+    task.add_done_callback(_refresh_done)
+
+
+async def cached_bytes(namespace: str, key: str, producer, ttl: float = RESPONSE_CACHE_TTL,
+                       stale_ttl: float = 0, beta: float = 0, refresher=None, bypass: bool = False) -> bytes:
+    # Return the stored bytes on a hit; otherwise await producer() and store its
+    # result. With a refresher, stale (stale_ttl) and XFetch-early (beta) hits
+    # are served as-is while refresher() runs in the background.
+    # bypass: neither read nor store, for clients pinned to the primary that
+    # must see their own writes (see database.pinned_to_primary).
+    if bypass:
+        metrics.inc("cache.bypasses")
+        return await producer()
+    cache_key = f"{namespace}:{key}"
+    entry = response_cache.local.get(cache_key)
+    if entry is None:
+        entry = await _blocking(response_cache.get, cache_key)
+    if entry is not None:
+        fresh_until, delta, value = _unpack(entry)
+        fresh = time.time() < fresh_until
+        if fresh and (refresher is None or not _early_refresh(fresh_until, delta, beta)):
+            metrics.inc("cache.hits")
+            return value
+        if refresher is not None and (fresh or stale_ttl):
+            metrics.inc("cache.stale_hits")
+            _refresh_in_background(namespace, cache_key, refresher, ttl, stale_ttl)
+            return value
+
+    inflight = _inflight.get(cache_key)
+    if inflight is not None:
+        metrics.inc("cache.coalesced")
+        return await asyncio.shield(inflight)
+
+    metrics.inc("cache.misses")
+    return await _lead(_start_flight(cache_key), namespace, cache_key, producer, ttl, stale_ttl)
+
+
+async def cached_json(namespace: str, key: str, loader, response_model, db, ttl: float = RESPONSE_CACHE_TTL,
+                      stale_ttl: float = 0, beta: float = 0, tag=None, bypass: bool = False) -> tuple[str, bytes]:
+    # Serialize once per cache fill; hits are served from the stored bytes.
+    # loader(db) returns the data. Background refreshes outlive the request,
+    # so they call it with a session of their own.
+    # response_model=None: the loader already returns JSON-ready data shaped
+    # like the route's response model (see serializers.RowSerializer).
+    # tag(db), read before the data, is stored with the body and returned
+    # with it (see conditional.cached_response).
+    async def produce(session):
+        tag_value = await tag(session) if tag else ""
+        data = await loader(session)
+        if response_model is None:
+            body = responses.dumps(data)
+        else:
+            body = response_model.model_validate(data).model_dump_json().encode("utf-8")
+        return tag_value.encode("utf-8") + b"\n" + body
+
+    async def refresh():
+        async with database.read_session() as session:
+            return await produce(session)
+
+    refresher = refresh if stale_ttl or beta else None
+    entry = await cached_bytes(namespace, key, lambda: produce(db), ttl, stale_ttl, beta, refresher, bypass)
+    tag_value, _, body = entry.partition(b"\n")
+    return tag_value.decode("utf-8"), body
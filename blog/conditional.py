@@ -0,0 +1,72 @@
+from fastapi import Request, Response
+from . import cache, database
+from .repo.common import run_repo, get_versions, get_versions_async
+
+# Conditional GET for the catalog routes. The ETag comes from the table change
+# counters (models.TableVersion). List routes store it with their cached body
+# (cached_response), so a hit answers 200 or 304 without the database. Detail
+# routes use the counters cached on their own (table_etag); both are dropped
+# by the same invalidation as the response bodies.
+
+# Tables whose writes change each namespace's responses
+NAMESPACE_TABLES = {
+    "programs": ["programs"],
+    "services": ["services"],
+    "events": ["events"],
+    "blog": ["blogs", "users"],
+    "home": ["programs", "services", "events", "blogs", "users"],
+}
+
+
+async def version_etag(namespace: str, db) -> str:
+    # Read from the database, not cached
+    tables = NAMESPACE_TABLES[namespace]
+    versions = await run_repo(get_versions, get_versions_async, tables, db=db)
+    return f'"{namespace}-{".".join(str(versions.get(table, 0)) for table in tables)}"'
+
+
+async def table_etag(request: Request, namespace: str, db) -> str:
+    async def produce():
+        return (await version_etag(namespace, db)).encode("ascii")
+
+    bypass = database.pinned_to_primary(request)
+    return (await cache.cached_bytes(namespace, "etag", produce, bypass=bypass)).decode("ascii")
+
+
+async def cached_response(request: Request, namespace: str, key: str, loader, db, **kwargs) -> Response:
+    # A cached list body (cache.cached_json) sent with the ETag of the table
+    # versions read just before it, or a 304 if the client already has that
+    # body. Served stale, body and ETag stay in step, and while the cache
+    # refreshes in the background no request waits on the database.
+    etag, body = await cache.cached_json(
+        namespace, key, loader, None, db, tag=lambda session: version_etag(namespace, session),
+        bypass=database.pinned_to_primary(request), **kwargs
+    )
+    return not_modified(request, etag) or Response(body, media_type="application/json", headers=etag_headers(etag))
+
+
+def entity_etag(etag: str, id) -> str:
+    return f'{etag[:-1]}-{id}"'
+
+
+def etag_headers(etag: str) -> dict:
+    # no-cache: browsers may keep the body but must revalidate it with If-None-Match
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _opaque(tag: str) -> str:
+    # If-None-Match uses weak comparison: W/"x" matches "x"
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def not_modified(request: Request, etag: str, exists: bool = True) -> Response | None:
+    # exists=False: the resource hasn't been looked up yet, so "*" (any
+    # current representation) can't match. Detail routes check once before
+    # the query, for the cheap ETag match, and again once the row is found.
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    candidates = {_opaque(tag.strip()) for tag in if_none_match.split(",")}
+    if _opaque(etag) in candidates or (exists and "*" in candidates):
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
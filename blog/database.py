@@ -1,25 +1,199 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc, inspect, text, bindparam, DateTime
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from fastapi import Request
+from contextlib import asynccontextmanager
+import logging
+import multiprocessing
+from datetime import datetime, timezone
 import os
+import time
 from dotenv import load_dotenv
+from . import metrics
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./blog.db")
 
-# SQLite-specific connection args
-connect_args = {}
-if DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+# Optional read replica for the public read routes (see get_read_db)
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+
+
+# Optional async engine (ASYNC_DB=true). Read routes then await the database
+# instead of holding a thread-pool slot. Needs aiosqlite or asyncpg.
+ASYNC_DB = os.getenv("ASYNC_DB", "false").lower() in ("1", "true", "yes")
+
+
+# Connection pool sizing. Every gunicorn worker gets its own pool (two with
+# ASYNC_DB: the sync engine still serves writes), so the defaults split
+# DB_MAX_CONNECTIONS (minus a reserve for admin/migration sessions) across
+# WEB_CONCURRENCY workers and their engines instead of using SQLAlchemy's
+# fixed 5 + 10 per engine.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "100"))
+DB_RESERVED_CONNECTIONS = int(os.getenv("DB_RESERVED_CONNECTIONS", "10"))
+
+_engines_per_worker = 2 if ASYNC_DB else 1
+_per_engine = (DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS) // (WEB_CONCURRENCY * _engines_per_worker)
+if _per_engine < 1:
+    # Every engine needs at least one connection
+    logger.warning(
+        "DB_MAX_CONNECTIONS=%d (minus %d reserved) is less than one connection for each of "
+        "%d workers x %d engines; pools will open up to %d connections",
+        DB_MAX_CONNECTIONS, DB_RESERVED_CONNECTIONS, WEB_CONCURRENCY, _engines_per_worker,
+        WEB_CONCURRENCY * _engines_per_worker,
+    )
+    _per_engine = 1
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", min(5, max(1, _per_engine // 2))))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", min(10, max(0, _per_engine - DB_POOL_SIZE))))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+
+def _timed_pool(pool_class):
+    # Records how long each checkout waited for a free connection
+    class TimedPool(pool_class):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            except exc.TimeoutError:
+                metrics.inc("db.pool.timeouts")
+                raise
+            finally:
+                metrics.observe("db.pool.checkout_wait_ms", (time.perf_counter() - start) * 1000)
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+def pool_options(pool_class, url: str) -> dict:
+    # SQLite keeps SQLAlchemy's default pool; the budget only matters for server databases
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": _timed_pool(pool_class),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+
+# SQLite production profile, applied to every new connection. WAL lets readers
+# run while a writer commits, and busy_timeout makes writers from other
+# gunicorn workers wait instead of failing with "database is locked".
+# SQLITE_PRAGMAS=false turns the whole profile off.
+SQLITE_PRAGMAS_ENABLED = os.getenv("SQLITE_PRAGMAS", "true").lower() in ("1", "true", "yes")
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-64000")),  # negative = KiB, so 64 MB
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            if not str(value).lstrip("-").isalnum():
+                raise ValueError(f"Invalid value for SQLite pragma {name}: {value!r}")
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def make_engine(url: str):
+    # SQLite-specific connection args
+    connect_args = {}
+    if url.startswith("sqlite"):
+        connect_args = {"check_same_thread": False}
+
+    new_engine = create_engine(url, connect_args=connect_args, **pool_options(QueuePool, url))
+    if url.startswith("sqlite") and SQLITE_PRAGMAS_ENABLED:
+        event.listen(new_engine, "connect", apply_sqlite_pragmas)
+    return new_engine
+
+
+engine = make_engine(DATABASE_URL)
+read_engine = make_engine(READ_DATABASE_URL) if READ_DATABASE_URL else engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
 
+def add_missing_columns(bind, metadata):
+    # create_all() only creates missing tables. Add the columns and indexes
+    # that models gained since an existing database was created.
+    inspector = inspect(bind)
+    now = datetime.now(timezone.utc)
+    with bind.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            missing = [column for column in table.columns if column.name not in existing]
+            for column in missing:
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(bind.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" NOT NULL DEFAULT {column.server_default.arg}"
+                conn.execute(text(ddl))
+            # Plain SQL so the columns' onupdate hooks don't fire for the backfill
+            for column in missing:
+                if isinstance(column.type, DateTime):
+                    backfill = text(f"UPDATE {table.name} SET {column.name} = :now").bindparams(bindparam("now", now, type_=column.type))
+                    conn.execute(backfill)
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
+def to_async_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql+psycopg2:"):
+        return url.replace("postgresql+psycopg2:", "postgresql+asyncpg:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    return url
+
+
+def make_async_engine(url: str):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    new_engine = create_async_engine(url, **pool_options(AsyncAdaptedQueuePool, url))
+    if url.startswith("sqlite") and SQLITE_PRAGMAS_ENABLED:
+        event.listen(new_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    return new_engine
+
+
+async_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+if ASYNC_DB:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+    async_engine = make_async_engine(ASYNC_DATABASE_URL)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async_read_engine = async_engine
+    if READ_DATABASE_URL:
+        async_read_engine = make_async_engine(os.getenv("ASYNC_READ_DATABASE_URL", to_async_url(READ_DATABASE_URL)))
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+
 
 def get_db():
     db = SessionLocal()
@@ -27,3 +201,53 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Replica lag tolerance: after a successful write the client gets a cookie
+# that keeps its reads on the primary for this many seconds (see main.py),
+# so it reads its own writes.
+REPLICA_LAG_SECONDS = float(os.getenv("REPLICA_LAG_SECONDS", "5"))
+PRIMARY_PIN_COOKIE = "read_primary_until"
+
+
+def pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def get_sync_read_db(request: Request):
+    factory = SessionLocal if pinned_to_primary(request) else ReadSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    factory = AsyncSessionLocal if pinned_to_primary(request) else AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
+
+
+@asynccontextmanager
+async def read_session(primary: bool = False):
+    # A read session of its own, for work that outlives the request (cache
+    # refreshes) or runs beside it (concurrent section queries)
+    if ASYNC_DB:
+        factory = AsyncSessionLocal if primary else AsyncReadSessionLocal
+        async with factory() as db:
+            yield db
+    else:
+        db = (SessionLocal if primary else ReadSessionLocal)()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+# Session used by read-only routes: the replica when READ_DATABASE_URL is set,
+# async when ASYNC_DB is on
+get_read_db = get_async_read_db if ASYNC_DB else get_sync_read_db
@@ -1,7 +1,37 @@
 from passlib.context import CryptContext
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException
+import asyncio
 import hashlib
+import multiprocessing
+import os
+from dotenv import load_dotenv
+from . import metrics
 
-pwd_cxt = CryptContext(schemes=["bcrypt"], deprecated="auto")
+load_dotenv()
+
+# Work factor from calibrate_hashing.py. Hashes made with any other cost are
+# flagged by needs_update and re-hashed on the user's next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+pwd_cxt = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+# bcrypt runs in worker processes so it doesn't hold the GIL of the web worker.
+# HASH_POOL_WORKERS=0 falls back to the default thread pool. Every gunicorn
+# worker has its own pool, so by default they share the cores between them.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", max(1, multiprocessing.cpu_count() // WEB_CONCURRENCY)))
+# Hash requests allowed to wait for the pool before new ones get a 503
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", "32"))
+
+_executor: ProcessPoolExecutor | None = None
+_pending = 0
 
 def hash_password(password: str) -> str:
     # ALWAYS pre-hash
@@ -11,3 +41,52 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     sha256 = hashlib.sha256(plain_password.encode("utf-8")).hexdigest()
     return pwd_cxt.verify(sha256, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    # Returns a replacement hash when the stored one was made with a different cost
+    sha256 = hashlib.sha256(plain_password.encode("utf-8")).hexdigest()
+    return pwd_cxt.verify_and_update(sha256, hashed_password)
+
+
+def _get_executor():
+    global _executor
+    if HASH_POOL_WORKERS <= 0:
+        return None
+    if _executor is None:
+        # spawn: forking a web worker that already runs threads is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=HASH_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def _run(func, *args):
+    global _pending
+    if _pending >= HASH_MAX_PENDING:
+        metrics.inc("hashing.rejected")
+        raise HTTPException(status_code=503, detail="Server busy, please try again", headers={"Retry-After": "1"})
+
+    _pending += 1
+    metrics.set_gauge("hashing.queue_depth", _pending)
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _pending -= 1
+        metrics.set_gauge("hashing.queue_depth", _pending)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run(hash_password, password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await _run(verify_and_update_password, plain_password, hashed_password)
+
+
+def shutdown_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
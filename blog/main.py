@@ -1,15 +1,31 @@
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
+from http.cookies import SimpleCookie
+import math
+import time
+from starlette.datastructures import MutableHeaders
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from . import models
-from .database import engine, SessionLocal
-from .routers import blog, user,authentication,program,service,event
+from . import database
+from . import hashing, cache, responses, migrate
+from .routers import blog, user,authentication,program,service,event,metrics,changes,home,admin
 
 
 
-app = FastAPI()
+app = FastAPI(default_response_class=responses.default_response_class)
+
+@app.on_event("startup")
+def subscribe_cache_invalidations():
+    cache.response_cache.start()
+
+@app.on_event("shutdown")
+def unsubscribe_cache_invalidations():
+    cache.response_cache.stop()
+
+@app.on_event("shutdown")
+def shutdown_hash_pool():
+    hashing.shutdown_pool()
 
 @app.get("/")
 async def root():
@@ -25,6 +41,39 @@ app.add_middleware(
 )
 
 
+class PinWritersToPrimary:
+    # Keep a client's reads off the replica until it has caught up with the
+    # client's write. Plain ASGI: it only touches the response headers, so
+    # streamed and static responses pass through untouched.
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH", "DELETE"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = SimpleCookie()
+                cookie[database.PRIMARY_PIN_COOKIE] = str(time.time() + database.REPLICA_LAG_SECONDS)
+                cookie[database.PRIMARY_PIN_COOKIE].update({
+                    "max-age": math.ceil(database.REPLICA_LAG_SECONDS),
+                    "path": "/",
+                    "httponly": True,
+                    "samesite": "lax",
+                })
+                MutableHeaders(scope=message).append("set-cookie", cookie.output(header="").strip())
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
+
+
+# Without a replica every read already goes to the primary
+if database.READ_DATABASE_URL:
+    app.add_middleware(PinWritersToPrimary)
+
 
 app.include_router(blog.router)
 app.include_router(user.router)
@@ -32,10 +81,14 @@ app.include_router(authentication.router)
 app.include_router(program.router)
 app.include_router(service.router)
 app.include_router(event.router)
+app.include_router(metrics.router)
+app.include_router(changes.router)
+app.include_router(home.router)
+app.include_router(admin.router)
 
 
-# Create tables
-models.Base.metadata.create_all(bind=engine)
+# Create tables (once across workers, see migrate.py)
+migrate.run()
 
 app.mount("/", StaticFiles(directory="frontend/client", html=True), name="static")
 
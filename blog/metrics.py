@@ -0,0 +1,35 @@
+from collections import defaultdict
+from threading import Lock
+
+# Minimal per-worker metrics registry, exposed as JSON on GET /metrics
+_lock = Lock()
+_counters: dict[str, float] = defaultdict(float)
+_gauges: dict[str, float] = {}
+_timings: dict[str, dict[str, float]] = {}
+
+
+def inc(name: str, value: float = 1):
+    with _lock:
+        _counters[name] += value
+
+
+def set_gauge(name: str, value: float):
+    with _lock:
+        _gauges[name] = value
+
+
+def observe(name: str, value: float):
+    with _lock:
+        timing = _timings.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+        timing["count"] += 1
+        timing["sum"] += value
+        timing["max"] = max(timing["max"], value)
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "timings": {name: dict(timing) for name, timing in _timings.items()},
+        }
@@ -0,0 +1,55 @@
+import contextlib
+import os
+import tempfile
+from sqlalchemy import exc
+from . import database, models
+from .repo import blog as blog_repo
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock
+    fcntl = None
+
+# Every gunicorn worker imports the app and would migrate at once. The first
+# one to take this lock does the work; the rest then find it done.
+MIGRATION_LOCK_FILE = os.getenv("MIGRATION_LOCK_FILE", os.path.join(tempfile.gettempdir(), "blog-migrate.lock"))
+
+
+@contextlib.contextmanager
+def _locked(path: str):
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _tolerating_existing(step, *args):
+    # The file lock only covers one host. If another host created a table or
+    # index between our check and our CREATE, run the step again: its checks
+    # then skip what already exists.
+    try:
+        step(*args)
+    except (exc.OperationalError, exc.ProgrammingError) as error:
+        if "already exists" not in str(error.orig).lower():
+            raise
+        step(*args)
+
+
+def run(engine=None):
+    # Create tables, add columns/indexes models gained, backfill summaries.
+    # Runs at app import (see main.py), or on its own: python -m blog.migrate
+    engine = engine or database.engine
+    with _locked(MIGRATION_LOCK_FILE):
+        _tolerating_existing(models.Base.metadata.create_all, engine)
+        _tolerating_existing(database.add_missing_columns, engine, models.Base.metadata)
+        with database.SessionLocal(bind=engine) as db:
+            blog_repo.backfill_summaries(db)
+
+
+if __name__ == "__main__":
+    run()
@@ -1,9 +1,22 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, Boolean, Index, text
 from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
 from .database import Base
 
 
-class User(Base):
+def utcnow():
+    return datetime.now(timezone.utc)
+
+
+class Timestamped:
+    # Set on every insert/update, including the bulk UPDATE statements in repo/.
+    # version counts the updates a row has had.
+    created_at = Column(DateTime(timezone=True), default=utcnow, index=True)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, index=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("version + 1"))
+
+
+class User(Timestamped, Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -11,12 +24,12 @@ class User(Base):
     email = Column(String, unique=True)
     password = Column(String)
     phone_number = Column(String, nullable=True)
-    role = Column(String, default="member")
+    role = Column(String, default="member", index=True)
 
     blogs = relationship("Blog", back_populates="owner")
 
 
-class Blog(Base):
+class Blog(Timestamped, Base):
     __tablename__ = "blogs"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -24,12 +37,17 @@ class Blog(Base):
     body = Column(String)
     image_url = Column(String, nullable=True)
 
+    # Computed from body on create/update so list pages never read body
+    excerpt = Column(String, nullable=True)
+    word_count = Column(Integer, nullable=True)
+    reading_time = Column(Integer, nullable=True)  # minutes
+
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     owner = relationship("User", back_populates="blogs")
 
 
-class Program(Base):
+class Program(Timestamped, Base):
     __tablename__ = "programs"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -42,7 +60,7 @@ class Program(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
 
-class Event(Base):
+class Event(Timestamped, Base):
     __tablename__ = "events"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -55,7 +73,7 @@ class Event(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
 
-class Service(Base):
+class Service(Timestamped, Base):
     __tablename__ = "services"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -64,3 +82,26 @@ class Service(Base):
     description = Column(String)
     price = Column(Float)
     image_url = Column(String, nullable=True)
+
+
+class TableVersion(Base):
+    # Change counter per table, bumped in the same transaction as every write.
+    # Drives the ETags of the list and detail routes.
+    __tablename__ = "table_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class ChangeLog(Base):
+    # One row per insert, update or delete made through blog/repo, written in
+    # the same transaction. id is the cursor of GET /changes.
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True)
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+    changed_at = Column(DateTime(timezone=True), default=utcnow)
+
+    __table_args__ = (Index("ix_change_log_entity_id", "entity", "id"),)
@@ -2,11 +2,47 @@
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi import Depends,HTTPException,status
 from sqlalchemy.orm import Session
-from . import token, database, models
+from threading import Lock
+import os
+import time
+from . import token, database, models, schema
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+# Per-worker cache of authenticated users, keyed by the token's uid claim
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "1024"))
+
+_user_cache: dict[int, tuple[float, schema.UserResponse]] = {}
+_user_cache_lock = Lock()
+
+
+def _cached_user(user_id: int):
+    entry = _user_cache.get(user_id)
+    if entry is None:
+        return None
+    expires_at, user = entry
+    if expires_at < time.monotonic():
+        _user_cache.pop(user_id, None)
+        return None
+    return user
+
+
+def _cache_user(user: schema.UserResponse):
+    with _user_cache_lock:
+        if len(_user_cache) >= USER_CACHE_MAX_SIZE:
+            # Drop the entry closest to expiry
+            oldest = min(_user_cache, key=lambda key: _user_cache[key][0])
+            _user_cache.pop(oldest, None)
+        _user_cache[user.id] = (time.monotonic() + USER_CACHE_TTL, user)
+
+
+def invalidate_user(user_id: int):
+    with _user_cache_lock:
+        _user_cache.pop(int(user_id), None)
+
+
 def get_current_user(token_str: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -14,7 +50,26 @@ def get_current_user(token_str: str = Depends(oauth2_scheme), db: Session = Depe
         headers={"WWW-Authenticate": "Bearer"},
     )
     token_data = token.verify_access_token(token_str, credentials_exception)
-    user = db.query(models.User).filter(models.User.email == token_data.username).first()
+
+    user = _cached_user(token_data.id) if token_data.id is not None else None
     if user is None:
+        if token_data.id is not None:
+            db_user = db.query(models.User).filter(models.User.id == token_data.id).first()
+        else:
+            # Tokens issued before the uid claim existed
+            db_user = db.query(models.User).filter(models.User.email == token_data.username).first()
+        if db_user is None:
+            raise credentials_exception
+        user = schema.UserResponse.model_validate(db_user)
+        _cache_user(user)
+
+    # A token stops working once the account's email changes
+    if user.email != token_data.username:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return user
+
+
+def get_current_admin(user: schema.UserResponse = Depends(get_current_user)):
+    if user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return user
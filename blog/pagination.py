@@ -0,0 +1,74 @@
+import base64
+import json
+from fastapi import HTTPException
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_id
+
+
+def _page(rows, key_column, limit: int):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], key_column.key))
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def paginate_rows(stmt, key_column, db, limit: int = DEFAULT_LIMIT, cursor: str | None = None):
+    # Seek on the key instead of OFFSET so deep pages cost the same as the first one.
+    # Takes a select() of columns and returns Core Row tuples, no ORM objects.
+    last_id = decode_cursor(cursor)
+    if last_id is not None:
+        stmt = stmt.where(key_column > last_id)
+
+    # Fetch one extra row to know whether another page exists
+    rows = db.execute(stmt.order_by(key_column).limit(limit + 1)).all()
+    return _page(rows, key_column, limit)
+
+
+async def paginate_rows_async(stmt, key_column, db, limit: int = DEFAULT_LIMIT, cursor: str | None = None):
+    # paginate_rows() on an AsyncSession
+    last_id = decode_cursor(cursor)
+    if last_id is not None:
+        stmt = stmt.where(key_column > last_id)
+
+    result = await db.execute(stmt.order_by(key_column).limit(limit + 1))
+    return _page(result.all(), key_column, limit)
+
+
+def stream_rows(stmt, key_column, db, cursor: str | None = None, batch: int = 100):
+    # Every row after the cursor, one batch at a time off a server-side
+    # cursor (yield_per), so memory doesn't grow with the table
+    last_id = decode_cursor(cursor)
+    if last_id is not None:
+        stmt = stmt.where(key_column > last_id)
+    result = db.execute(stmt.order_by(key_column).execution_options(yield_per=batch))
+    yield from result.partitions()
+
+
+async def stream_rows_async(stmt, key_column, db, cursor: str | None = None, batch: int = 100):
+    # stream_rows() on an AsyncSession
+    last_id = decode_cursor(cursor)
+    if last_id is not None:
+        stmt = stmt.where(key_column > last_id)
+    result = await db.stream(stmt.order_by(key_column).execution_options(yield_per=batch))
+    async for rows in result.partitions():
+        yield rows
@@ -0,0 +1,57 @@
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session, joinedload
+from .. import models
+from .changes import ENTITIES
+
+# Dashboard numbers come from aggregates and small LIMIT queries, so opening
+# it never loads whole tables
+
+
+def _count_query():
+    # One statement, one scalar subquery per table
+    return select(*(
+        select(func.count()).select_from(model).scalar_subquery().label(name)
+        for name, (model, _) in ENTITIES.items()
+    ))
+
+
+def _roles_query():
+    return select(models.User.role, func.count()).group_by(models.User.role)
+
+
+def _recent_query(model, limit: int):
+    stmt = select(model).order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+    if model is models.Blog:
+        stmt = stmt.options(joinedload(models.Blog.owner))
+    return stmt
+
+
+def _serialize(name: str, rows):
+    response_schema = ENTITIES[name][1]
+    return [{**response_schema.model_validate(row).model_dump(mode="json"), "id": row.id} for row in rows]
+
+
+def get_summary(db: Session, recent: int = 5):
+    counts = db.execute(_count_query()).one()._asdict()
+    roles = dict(db.execute(_roles_query()).all())
+    latest = {name: _serialize(name, db.scalars(_recent_query(model, recent)).all()) for name, (model, _) in ENTITIES.items()}
+    return {"counts": counts, "users_by_role": roles, "recent": latest}
+
+
+async def get_summary_async(db, recent: int = 5):
+    counts = (await db.execute(_count_query())).one()._asdict()
+    roles = dict((await db.execute(_roles_query())).all())
+    latest = {}
+    for name, (model, _) in ENTITIES.items():
+        latest[name] = _serialize(name, (await db.scalars(_recent_query(model, recent))).all())
+    return {"counts": counts, "users_by_role": roles, "recent": latest}
+
+
+# Never leaves the server, not even in an admin export
+EXPORT_EXCLUDE = {"password"}
+
+
+def export_query(entity: str):
+    # Every stored column of the entity's table, in table order
+    model, _ = ENTITIES[entity]
+    return select(*(column for column in model.__table__.columns if column.name not in EXPORT_EXCLUDE))
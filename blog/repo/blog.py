@@ -1,56 +1,123 @@
-from sqlalchemy.orm import Session
-from .. import schema, database, models
+import math
+from sqlalchemy import select, update, delete, bindparam
+from sqlalchemy.orm import Session, joinedload
+from .. import schema, database, models, pagination, cache
 from fastapi import HTTPException
+from .common import execute_write, record_changes, bump_version
+from ..serializers import RowSerializer
 
 get_db=database.get_db
 
+EXCERPT_LENGTH = 200
+WORDS_PER_MINUTE = 200
 
-def get_all(db: Session):
-    blogs = db.query(models.Blog).all()
-    return blogs
+
+def summarize(body: str | None) -> dict:
+    # excerpt, word_count and reading_time, stored next to the body
+    words = (body or "").split()
+    excerpt = " ".join(words)
+    if len(excerpt) > EXCERPT_LENGTH:
+        excerpt = excerpt[:EXCERPT_LENGTH].rsplit(" ", 1)[0] + "…"
+    return {
+        "excerpt": excerpt,
+        "word_count": len(words),
+        "reading_time": math.ceil(len(words) / WORDS_PER_MINUTE),
+    }
+
+
+def backfill_summaries(db: Session, batch: int = 500) -> int:
+    # Posts written before the summary columns existed. updated_at and
+    # version are set to themselves so this doesn't count as an edit.
+    stmt = (
+        update(models.Blog.__table__)
+        .where(models.Blog.id == bindparam("blog_id"))
+        .values(excerpt=bindparam("excerpt"), word_count=bindparam("word_count"),
+                reading_time=bindparam("reading_time"),
+                updated_at=models.Blog.updated_at, version=models.Blog.version)
+    )
+    done = 0
+    while True:
+        rows = db.execute(
+            select(models.Blog.id, models.Blog.body).where(models.Blog.excerpt.is_(None)).limit(batch)
+        ).all()
+        if not rows:
+            break
+        db.execute(stmt, [{"blog_id": id, **summarize(body)} for id, body in rows])
+        done += len(rows)
+    if done:
+        bump_version(db, models.Blog.__tablename__)
+    db.commit()
+    if done:
+        cache.invalidate('blog')
+    return done
+
+
+# List pages are built from Core rows; see serializers.RowSerializer
+list_rows = RowSerializer(models.Blog, schema.BlogSummary, {"owner": (models.Blog.owner, models.User, schema.UserResponse)})
+
+
+def get_all(db: Session, limit: int = pagination.DEFAULT_LIMIT, cursor: str | None = None, fields: tuple | None = None):
+    rows = list_rows.project(fields)
+    page = pagination.paginate_rows(rows.select(), models.Blog.id, db, limit, cursor)
+    return rows.page(page)
+
+
+async def get_all_async(db, limit: int = pagination.DEFAULT_LIMIT, cursor: str | None = None, fields: tuple | None = None):
+    rows = list_rows.project(fields)
+    page = await pagination.paginate_rows_async(rows.select(), models.Blog.id, db, limit, cursor)
+    return rows.page(page)
 
 
 
 def create_blog(id,request: schema.Blog, db:Session):
-    # Getting user from database (assuming user with id=1 exists)
-    user = db.query(models.User).filter(models.User.id == id)
-   
+    # id: the author's user id
     new_blog = models.Blog(
                 title=request.title,
                 body=request.body,
                 image_url=request.image_url,
-                 owner=user
+                user_id=id,
+                **summarize(request.body)
             )
 
     db.add(new_blog)
+    db.flush()
+    record_changes(db, models.Blog, [new_blog.id])
     db.commit()
     db.refresh(new_blog)
+    cache.invalidate('blog')
     return new_blog
 
 
 def get_blog_by_id(id: int, db: Session):
-    blog = db.query(models.Blog).filter(models.Blog.id == id).first()
+    blog = db.query(models.Blog).options(joinedload(models.Blog.owner)).filter(models.Blog.id == id).first()
+    if not blog:
+        raise HTTPException(status_code=404, detail="Blog not found")
+    return blog
+
+
+async def get_blog_by_id_async(id: int, db):
+    result = await db.execute(select(models.Blog).options(joinedload(models.Blog.owner)).where(models.Blog.id == id))
+    blog = result.scalars().first()
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
     return blog
 
 def delete_blog(id: int, db: Session):
-    blog = db.query(models.Blog).filter(models.Blog.id == id)
-    if not blog.first():
+    stmt = delete(models.Blog).where(models.Blog.id == id)
+    if not execute_write(stmt, models.Blog, db, id):
         raise HTTPException(status_code=404, detail="Blog not found")
-    blog.delete(synchronize_session=False)
-    db.commit()
+    cache.invalidate('blog')
     return {'done'}
 
 
 def update_blog(id: int, request: schema.Blog, db: Session):
-    blog = db.query(models.Blog).filter(models.Blog.id == id)
-    if not blog.first():
-        raise HTTPException(status_code=404, detail="Blog not found")
-    blog.update({
+    stmt = update(models.Blog).where(models.Blog.id == id).values({
         'title': request.title,
         'body': request.body,
-        'image_url': request.image_url
+        'image_url': request.image_url,
+        **summarize(request.body)
     })
-    db.commit()
+    if not execute_write(stmt, models.Blog, db, id):
+        raise HTTPException(status_code=404, detail="Blog not found")
+    cache.invalidate('blog')
     return 'Blog Updated Successfully'
\ No newline at end of file
@@ -0,0 +1,98 @@
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session, joinedload
+from .. import schema, models, pagination
+
+# Entity name (the table name, as written to change_log) -> model and the
+# schema its list route serializes with
+ENTITIES = {
+    "users": (models.User, schema.UserResponse),
+    "blogs": (models.Blog, schema.BlogResponse),
+    "programs": (models.Program, schema.ProgramResponse),
+    "events": (models.Event, schema.Event),
+    "services": (models.Service, schema.ServiceResponse),
+}
+
+
+def _log_query(since: int, entity: str | None, limit: int):
+    stmt = select(models.ChangeLog).where(models.ChangeLog.id > since)
+    if entity:
+        stmt = stmt.where(models.ChangeLog.entity == entity)
+    return stmt.order_by(models.ChangeLog.id).limit(limit + 1)
+
+
+def _rows_query(entity: str, ids):
+    model, _ = ENTITIES[entity]
+    stmt = select(model).where(model.id.in_(ids))
+    if model is models.Blog:
+        stmt = stmt.options(joinedload(models.Blog.owner))
+    return stmt
+
+
+def _latest(entries):
+    # Several changes to one row within a page collapse into its last one
+    latest = {}
+    for entry in entries:
+        latest.pop((entry.entity, entry.entity_id), None)
+        latest[(entry.entity, entry.entity_id)] = entry
+    return list(latest.values())
+
+
+def _feed(entries, rows, cursor: int, has_more: bool):
+    changes = []
+    for entry in entries:
+        row = rows.get((entry.entity, entry.entity_id))
+        if entry.deleted or row is None:
+            # Rows deleted after this change show up as tombstones right away
+            changes.append({"entity": entry.entity, "id": entry.entity_id, "deleted": True})
+        else:
+            data = ENTITIES[entry.entity][1].model_validate(row).model_dump(mode="json")
+            changes.append({"entity": entry.entity, "id": entry.entity_id, "data": data})
+    return {"changes": changes, "next_cursor": pagination.encode_cursor(cursor), "has_more": has_more}
+
+
+def _ids_by_entity(entries):
+    ids = {}
+    for entry in entries:
+        if not entry.deleted:
+            ids.setdefault(entry.entity, []).append(entry.entity_id)
+    return ids
+
+
+def get_changes(db: Session, since: str | None = None, entity: str | None = None, limit: int = pagination.DEFAULT_LIMIT):
+    # No cursor yet: hand out the current head so the client can load the
+    # lists once and poll from there
+    if since is None:
+        head = db.scalar(select(func.max(models.ChangeLog.id))) or 0
+        return _feed([], {}, head, False)
+
+    last_id = pagination.decode_cursor(since)
+    entries = db.scalars(_log_query(last_id, entity, limit)).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        return _feed([], {}, last_id, False)
+
+    rows = {}
+    for name, ids in _ids_by_entity(entries).items():
+        for row in db.scalars(_rows_query(name, ids)).unique():
+            rows[(name, row.id)] = row
+    return _feed(_latest(entries), rows, entries[-1].id, has_more)
+
+
+async def get_changes_async(db, since: str | None = None, entity: str | None = None, limit: int = pagination.DEFAULT_LIMIT):
+    if since is None:
+        head = await db.scalar(select(func.max(models.ChangeLog.id))) or 0
+        return _feed([], {}, head, False)
+
+    last_id = pagination.decode_cursor(since)
+    entries = (await db.scalars(_log_query(last_id, entity, limit))).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        return _feed([], {}, last_id, False)
+
+    rows = {}
+    for name, ids in _ids_by_entity(entries).items():
+        for row in (await db.scalars(_rows_query(name, ids))).unique():
+            rows[(name, row.id)] = row
+    return _feed(_latest(entries), rows, entries[-1].id, has_more)
@@ -0,0 +1,68 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .. import models
+
+
+def execute_write(stmt, model, db: Session, id: int) -> int:
+    # One statement per write: stmt targets the row with primary key id, and
+    # its rowcount says whether that row existed. Callers 404 on 0.
+    stmt = stmt.execution_options(synchronize_session=False)
+    count = db.execute(stmt).rowcount
+    if count:
+        record_changes(db, model, [id], deleted=stmt.is_delete)
+    db.commit()
+    return count
+
+
+def record_changes(db: Session, model, ids, deleted: bool = False):
+    # Change log entries plus the ETag counters, in the caller's transaction.
+    # Bumping the "change_log" counter row locks it until commit, so change_log
+    # ids become visible in order and a /changes cursor never skips one.
+    bump_version(db, model.__tablename__, models.ChangeLog.__tablename__)
+    db.execute(
+        insert(models.ChangeLog),
+        [{"entity": model.__tablename__, "entity_id": id, "deleted": deleted} for id in ids],
+    )
+
+
+def bump_version(db: Session, *tables: str):
+    # One UPDATE for all the counters; joins the caller's transaction and the
+    # caller commits
+    stmt = (
+        update(models.TableVersion)
+        .where(models.TableVersion.name.in_(tables))
+        .values(version=models.TableVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(stmt).rowcount == len(tables):
+        return
+    # A table's first write: create its counter
+    existing = set(db.scalars(select(models.TableVersion.name).where(models.TableVersion.name.in_(tables))))
+    for table in tables:
+        if table in existing:
+            continue
+        try:
+            with db.begin_nested():
+                db.add(models.TableVersion(name=table, version=1))
+        except IntegrityError:
+            # Another worker created the row first
+            db.execute(stmt.where(models.TableVersion.name == table))
+
+
+def get_versions(tables: list[str], db: Session) -> dict[str, int]:
+    rows = db.execute(select(models.TableVersion.name, models.TableVersion.version).where(models.TableVersion.name.in_(tables)))
+    return dict(rows.all())
+
+
+async def get_versions_async(tables: list[str], db) -> dict[str, int]:
+    rows = await db.execute(select(models.TableVersion.name, models.TableVersion.version).where(models.TableVersion.name.in_(tables)))
+    return dict(rows.all())
+
+
+async def run_repo(sync_fn, async_fn, *args, db, **kwargs):
+    # Dispatch a repo call on the session type get_read_db handed out
+    if isinstance(db, Session):
+        return await run_in_threadpool(sync_fn, *args, db=db, **kwargs)
+    return await async_fn(*args, db=db, **kwargs)
@@ -1,15 +1,29 @@
+from sqlalchemy import select, update, delete
 from sqlalchemy.orm import Session
-from .. import schema, database, models
+from .. import schema, database, models, pagination, cache
 from fastapi import HTTPException
+from .common import execute_write, record_changes
+from ..serializers import RowSerializer
 
 get_db=database.get_db
 
 
 
 
-def get_all(db: Session):
-    events = db.query(models.Event).all()
-    return events
+# List pages are built from Core rows; see serializers.RowSerializer
+list_rows = RowSerializer(models.Event, schema.Event)
+
+
+def get_all(db: Session, limit: int = pagination.DEFAULT_LIMIT, cursor: str | None = None, fields: tuple | None = None):
+    rows = list_rows.project(fields)
+    page = pagination.paginate_rows(rows.select(), models.Event.id, db, limit, cursor)
+    return rows.page(page)
+
+
+async def get_all_async(db, limit: int = pagination.DEFAULT_LIMIT, cursor: str | None = None, fields: tuple | None = None):
+    rows = list_rows.project(fields)
+    page = await pagination.paginate_rows_async(rows.select(), models.Event.id, db, limit, cursor)
+    return rows.page(page)
 
 
 def create_event(request: schema.Event, db:Session, current_user_id: int):
@@ -23,8 +37,11 @@ def create_event(request: schema.Event, db:Session, current_user_id: int):
             )
 
     db.add(new_event)
+    db.flush()
+    record_changes(db, models.Event, [new_event.id])
     db.commit()
     db.refresh(new_event)
+    cache.invalidate('events')
     return new_event
 
 
@@ -35,24 +52,30 @@ def get_event_by_id(id: int, db: Session):
     return event
 
 
+async def get_event_by_id_async(id: int, db):
+    result = await db.execute(select(models.Event).where(models.Event.id == id))
+    event = result.scalars().first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event
+
+
 def delete_event(id: int, db: Session):
-    event = db.query(models.Event).filter(models.Event.id == id)
-    if not event.first():
+    stmt = delete(models.Event).where(models.Event.id == id)
+    if not execute_write(stmt, models.Event, db, id):
         raise HTTPException(status_code=404, detail="Event not found")
-    event.delete(synchronize_session=False)
-    db.commit()
+    cache.invalidate('events')
     return "Deleted Successfully"
 
 def update_event(id: int, request: schema.Event, db: Session):
-    event = db.query(models.Event).filter(models.Event.id == id)
-    if not event.first():
-        raise HTTPException(status_code=404, detail="Event not found")
-    event.update({
+    stmt = update(models.Event).where(models.Event.id == id).values({
         'name': request.name,
         'description': request.description,
         'date': request.date,
         'location': request.location,
         'image_url': request.image_url
     })
-    db.commit()
+    if not execute_write(stmt, models.Event, db, id):
+        raise HTTPException(status_code=404, detail="Event not found")
+    cache.invalidate('events')
     return 'Event Updated Successfully'
\ No newline at end of file
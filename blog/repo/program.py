@@ -1,7 +1,10 @@
+from sqlalchemy import select, update, delete
 from sqlalchemy.orm import Session
-from .. import schema, database, models
+from .. import schema, database, models, pagination, cache
 from typing import List
 from fastapi import HTTPException ,Depends
+from .common import execute_write, record_changes
+from ..serializers import RowSerializer
 
 get_db=database.get_db
 
@@ -16,15 +19,29 @@ def create_program(request:schema.Program, db:Session=Depends(get_db), current_u
         user_id=current_user.id if current_user else None
     )
     db.add(new_program)
+    db.flush()
+    record_changes(db, models.Program, [new_program.id])
     db.commit()
     db.refresh(new_program)
+    cache.invalidate('programs')
     return new_program
 
 
 
-def show_programs(db:Session=Depends(get_db)):
-    programs=db.query(models.Program).all()
-    return programs
+# List pages are built from Core rows; see serializers.RowSerializer
+list_rows = RowSerializer(models.Program, schema.ProgramResponse)
+
+
+def show_programs(db:Session=Depends(get_db), limit:int=pagination.DEFAULT_LIMIT, cursor:str | None=None, fields:tuple | None=None):
+    rows=list_rows.project(fields)
+    page=pagination.paginate_rows(rows.select(), models.Program.id, db, limit, cursor)
+    return rows.page(page)
+
+
+async def show_programs_async(db, limit:int=pagination.DEFAULT_LIMIT, cursor:str | None=None, fields:tuple | None=None):
+    rows=list_rows.project(fields)
+    page=await pagination.paginate_rows_async(rows.select(), models.Program.id, db, limit, cursor)
+    return rows.page(page)
 
 
 def get_program_by_id(id:int, db:Session=Depends(get_db)):
@@ -34,21 +51,27 @@ def get_program_by_id(id:int, db:Session=Depends(get_db)):
     return program
 
 
-def update_program(id:int, request:schema.Program, db:Session=Depends(get_db)):
-    program=db.query(models.Program).filter(models.Program.id==id)
-    if not program.first():
+async def get_program_by_id_async(id:int, db):
+    result=await db.execute(select(models.Program).where(models.Program.id==id))
+    program=result.scalars().first()
+    if not program:
         raise HTTPException(status_code=404, detail="Program not found")
+    return program
+
+
+def update_program(id:int, request:schema.Program, db:Session=Depends(get_db)):
     # prevent user_id from being overwritten from client input
     update_data = request.dict()
     update_data.pop('user_id', None)
-    program.update(update_data)
-    db.commit()
+    stmt=update(models.Program).where(models.Program.id==id).values(update_data)
+    if not execute_write(stmt, models.Program, db, id):
+        raise HTTPException(status_code=404, detail="Program not found")
+    cache.invalidate('programs')
     return "Updateed successfully"
 
 def delete_program(id:int, db:Session=Depends(get_db)):
-    program=db.query(models.Program).filter(models.Program.id==id)
-    if not program.first():
+    stmt=delete(models.Program).where(models.Program.id==id)
+    if not execute_write(stmt, models.Program, db, id):
         raise HTTPException(status_code=404, detail="Program not found")
-    program.delete(synchronize_session=False)
-    db.commit()
+    cache.invalidate('programs')
     return "Deleted successfully"
\ No newline at end of file
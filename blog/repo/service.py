@@ -1,13 +1,27 @@
+from sqlalchemy import select, update, delete
 from sqlalchemy.orm import Session
-from .. import schema, database, models
+from .. import schema, database, models, pagination, cache
 from fastapi import HTTPException
+from .common import execute_write, record_changes
+from ..serializers import RowSerializer
 
 get_db=database.get_db
 
 
-def get_all(db: Session):
-    services = db.query(models.Service).all()
-    return services
+# List pages are built from Core rows; see serializers.RowSerializer
+list_rows = RowSerializer(models.Service, schema.ServiceResponse)
+
+
+def get_all(db: Session, limit: int = pagination.DEFAULT_LIMIT, cursor: str | None = None, fields: tuple | None = None):
+    rows = list_rows.project(fields)
+    page = pagination.paginate_rows(rows.select(), models.Service.id, db, limit, cursor)
+    return rows.page(page)
+
+
+async def get_all_async(db, limit: int = pagination.DEFAULT_LIMIT, cursor: str | None = None, fields: tuple | None = None):
+    rows = list_rows.project(fields)
+    page = await pagination.paginate_rows_async(rows.select(), models.Service.id, db, limit, cursor)
+    return rows.page(page)
 
 
 def create_service(request: schema.Service, db:Session):
@@ -19,8 +33,11 @@ def create_service(request: schema.Service, db:Session):
             )
 
     db.add(new_service)
+    db.flush()
+    record_changes(db, models.Service, [new_service.id])
     db.commit()
     db.refresh(new_service)
+    cache.invalidate('services')
     return new_service
 
 
@@ -31,24 +48,30 @@ def  get_service_by_id(id: int, db: Session):
     return service
 
 
+async def get_service_by_id_async(id: int, db):
+    result = await db.execute(select(models.Service).where(models.Service.id == id))
+    service = result.scalars().first()
+    if not service:
+        raise HTTPException(status_code=404, detail="Service not found")
+    return service
+
+
 def delete_service(id: int, db: Session):
-    service = db.query(models.Service).filter(models.Service.id == id)
-    if not service.first():
+    stmt = delete(models.Service).where(models.Service.id == id)
+    if not execute_write(stmt, models.Service, db, id):
         raise HTTPException(status_code=404, detail="Service not found")
-    service.delete(synchronize_session=False)
-    db.commit()
+    cache.invalidate('services')
     return "Deleted Successfully"
 
 
 def update_service(id: int, request: schema.Service, db: Session):
-    service = db.query(models.Service).filter(models.Service.id == id)
-    if not service.first():
-        raise HTTPException(status_code=404, detail="Service not found")
-    service.update({
+    stmt = update(models.Service).where(models.Service.id == id).values({
         'name': request.name,
         'description': request.description,
         'price': request.price,
         'image_url': request.image_url
     })
-    db.commit()
+    if not execute_write(stmt, models.Service, db, id):
+        raise HTTPException(status_code=404, detail="Service not found")
+    cache.invalidate('services')
     return 'Service Updated Successfully'
\ No newline at end of file
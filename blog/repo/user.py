@@ -1,19 +1,37 @@
+from sqlalchemy import select, update, delete
 from sqlalchemy.orm import Session
-from .. import schema, database, models
+from .. import schema, database, models, pagination, oauth, cache
 from typing import List
 from ..hashing import hash_password
 from fastapi import HTTPException ,Depends
+from .common import execute_write, record_changes
+from ..serializers import RowSerializer
 
-def get_all(db: Session):
-    users=db.query(models.User).all()
-    return users
+# List pages are built from Core rows; see serializers.RowSerializer
+list_rows = RowSerializer(models.User, schema.UserResponse)
 
-def create_user(request: schema.User, db: Session=Depends(database.get_db)):
-    hashed_password = hash_password(request.password)
+
+def get_all(db: Session, limit: int = pagination.DEFAULT_LIMIT, cursor: str | None = None, fields: tuple | None = None):
+    rows = list_rows.project(fields)
+    page = pagination.paginate_rows(rows.select(), models.User.id, db, limit, cursor)
+    return rows.page(page)
+
+
+async def get_all_async(db, limit: int = pagination.DEFAULT_LIMIT, cursor: str | None = None, fields: tuple | None = None):
+    rows = list_rows.project(fields)
+    page = await pagination.paginate_rows_async(rows.select(), models.User.id, db, limit, cursor)
+    return rows.page(page)
+
+
+def create_user(request: schema.User, db: Session=Depends(database.get_db), hashed_password: str | None = None):
+    if hashed_password is None:
+        hashed_password = hash_password(request.password)
     
     new_user=models.User(name=request.name,
         email=request.email,password=hashed_password, phone_number=request.phone_number)
     db.add(new_user)
+    db.flush()
+    record_changes(db, models.User, [new_user.id])
     db.commit()
     db.refresh(new_user)
     return new_user
@@ -26,21 +44,38 @@ def get_user_by_id(id: int, db: Session=Depends(database.get_db)):
     return user
 
 
-def delete_user(id: int, db: Session=Depends(database.get_db)):
-    user=db.query(models.User).filter(models.User.id==id)
+async def get_user_by_id_async(id: int, db):
+    result = await db.execute(select(models.User).where(models.User.id == id))
+    user = result.scalars().first()
     if not user:
-        raise HTTPException(status_code=404, detail="Blog not found")
-    user.delete(synchronize_session=False)
-    db.commit()
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+def delete_user(id: int, db: Session=Depends(database.get_db)):
+    stmt=delete(models.User).where(models.User.id==id)
+    if not execute_write(stmt, models.User, db, id):
+        raise HTTPException(status_code=404, detail="User not found")
+    oauth.invalidate_user(id)
+    # blog posts embed their owner
+    cache.invalidate('blog')
 
     return {'done'}
 
-def update_user(id: int, request: schema.User, db: Session=Depends(database.get_db)):
-    user=db.query(models.User).filter(models.User.id==id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Blog not found")
-    user.update(request.dict())
-    db.commit()
+def update_user(id: int, request: schema.User, db: Session=Depends(database.get_db), hashed_password: str | None = None,
+                current_user: schema.UserResponse | None = None):
+    # blogs is a relationship, not a column. The password is stored hashed,
+    # and only an admin may change a role.
+    values = request.dict(exclude={'blogs', 'password', 'role'})
+    values['password'] = hashed_password if hashed_password is not None else hash_password(request.password)
+    if current_user is not None and current_user.role == "admin" and 'role' in request.model_fields_set:
+        values['role'] = request.role
+    stmt=update(models.User).where(models.User.id==id).values(values)
+    if not execute_write(stmt, models.User, db, id):
+        raise HTTPException(status_code=404, detail="User not found")
+    oauth.invalidate_user(id)
+    # blog posts embed their owner
+    cache.invalidate('blog')
 
     return {'Done'}
 
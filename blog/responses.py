@@ -0,0 +1,41 @@
+from decimal import Decimal
+import json
+from fastapi.datastructures import Default
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # stdlib json
+    orjson = None
+
+
+def _default(obj):
+    # orjson handles dicts, lists, datetimes, UUIDs, enums and dataclasses
+    # itself; this covers the rest the way jsonable_encoder would
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    return jsonable_encoder(obj)
+
+
+def dumps(content) -> bytes:
+    if orjson is None:
+        return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+# App-wide default response class. FastAPI first turns the endpoint's return
+# value into JSON-ready Python (field.serialize for a response_model,
+# jsonable_encoder otherwise); orjson only replaces the final json.dumps.
+# Wrapped in Default() so FastAPI still treats it as the default class:
+# releases with a pydantic dump_json path for response_model routes (0.143
+# has one, 0.128 doesn't) only take it for the default class.
+default_response_class = Default(FastJSONResponse)
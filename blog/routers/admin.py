@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Literal
+from .. import schema, database, oauth, streaming
+
+from ..repo import admin, changes
+from ..repo.common import run_repo
+
+router=APIRouter(
+    prefix='/admin',
+    tags=["ADMIN"]
+)
+
+
+@router.get('/summary', response_model=schema.AdminSummary)
+async def show_summary(recent:int=Query(5, ge=0, le=50), db=Depends(database.get_read_db), current_user: schema.UserResponse = Depends(oauth.get_current_admin)):
+    return await run_repo(admin.get_summary, admin.get_summary_async, recent=recent, db=db)
+
+
+@router.get('/export/{entity}.{fmt}')
+def export(entity:Literal[tuple(changes.ENTITIES)], fmt:Literal['csv', 'jsonl'], gzip:bool=False, current_user: schema.UserResponse = Depends(oauth.get_current_admin)):
+    # Streams the whole table off a server-side cursor in batches
+    stmt = admin.export_query(entity)
+    return streaming.export_response(stmt, stmt.selected_columns.id, entity, fmt, gzip)
@@ -1,50 +1,74 @@
 from fastapi import APIRouter,Depends,HTTPException,status
+from fastapi.concurrency import run_in_threadpool
 from .. import schema,database,models
 from sqlalchemy.orm import Session
-from ..hashing import hash_password,verify_password
+from ..hashing import hash_password_async,verify_and_update_password_async
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from .. import token
+from ..repo.common import record_changes
 
 router=APIRouter(
     tags=["Authentication"]
 )
 
 
+def get_user_by_email(email: str, db: Session):
+    return db.query(models.User).filter(models.User.email == email).first()
 
+
+def add_user(user: models.User, db: Session):
+    db.add(user)
+    db.flush()
+    record_changes(db, models.User, [user.id])
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def update_password_hash(user: models.User, new_hash: str, db: Session):
+    user.password = new_hash
+    db.commit()
+
+
+# Async handlers: bcrypt runs in the hashing pool and the sync DB calls in the
+# thread pool, so a login burst doesn't tie up the threads other routes need.
 @router.post('/login')
-def login(request:OAuth2PasswordRequestForm=Depends(),db:Session=Depends(database.get_db)):
-    user=db.query(models.User).filter(models.User.email==request.username).first()
+async def login(request:OAuth2PasswordRequestForm=Depends(),db:Session=Depends(database.get_db)):
+    user=await run_in_threadpool(get_user_by_email, request.username, db)
     if not user:
         raise HTTPException(status_code=404, detail="Invalid Credentials, Please Try Again")
 
-    if not verify_password(request.password, user.password):
+    valid, new_hash = await verify_and_update_password_async(request.password, user.password)
+    if not valid:
         raise HTTPException(status_code=404, detail="Invalid Credentials, Please Try Again")
 
+    # Move the stored hash to the configured BCRYPT_ROUNDS while we have the password
+    if new_hash:
+        await run_in_threadpool(update_password_hash, user, new_hash, db)
 
-    return {"access_token":token.create_access_token(data={"sub":user.email}),
+
+    return {"access_token":token.create_access_token(data=token.user_claims(user)),
             "token_type":"bearer",
             "role": user.role
             }
 
 
 @router.post('/register', status_code=status.HTTP_201_CREATED)
-def register(request: schema.User, db: Session = Depends(database.get_db)):
-    existing = db.query(models.User).filter(models.User.email == request.email).first()
+async def register(request: schema.User, db: Session = Depends(database.get_db)):
+    existing = await run_in_threadpool(get_user_by_email, request.email, db)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed = hash_password(request.password)
+    hashed = await hash_password_async(request.password)
     new_user = models.User(name=request.name, email=request.email, password=hashed, phone_number=request.phone_number)
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    new_user = await run_in_threadpool(add_user, new_user, db)
 
     # Auto-login behavior: return the same response as /login
-    access_token = token.create_access_token(data={"sub": new_user.email})
+    access_token = token.create_access_token(data=token.user_claims(new_user))
     return {
         "access_token": access_token,
         "token_type": "bearer",
         "role": new_user.role,
         "message": "Registered successfully. Use this token or POST to /login.",
         "login_url": "/login",
-    }
\ No newline at end of file
+    }
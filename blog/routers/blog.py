@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends ,Response,status,HTTPException,Request
+from fastapi import APIRouter, Depends ,Response,status,HTTPException,Request,Query
 from sqlalchemy.orm import Session
-from .. import schema, database, models,oauth, token
+from .. import schema, database, conditional, models,oauth, token, pagination, serializers, streaming
 
 from typing import List
 from ..repo import blog
+from ..repo.common import run_repo
 
 get_db=database.get_db
 
@@ -14,19 +15,34 @@ router=APIRouter(
 )
 
 
-@router.get('/',)
-def show_all(db:Session=Depends(get_db)):
-    return blog.get_all(db)
+# Fields a list request may ask for with ?fields=
+LIST_FIELDS = ('id', 'title', 'excerpt', 'word_count', 'reading_time', 'image_url', 'owner')
+
+
+@router.get('/', response_model=schema.Page[schema.BlogSummary])
+async def show_all(request:Request, limit:int=Query(pagination.DEFAULT_LIMIT, ge=1, le=pagination.MAX_LIMIT), cursor:str | None=None, stream:bool=False, fields=Depends(serializers.fields_query(LIST_FIELDS)), db=Depends(database.get_read_db)):
+    if streaming.requested(request, stream):
+        return streaming.ndjson_response(blog.list_rows.project(fields), request, cursor)
+    return await conditional.cached_response(
+        request, 'blog', f'limit={limit}&cursor={cursor or ""}&fields={",".join(fields or ())}',
+        lambda session: run_repo(blog.get_all, blog.get_all_async, limit=limit, cursor=cursor, fields=fields, db=session),
+        db,
+    )
 
 
 @router.post("/", status_code=201, )
 def create(request: schema.Blog, db: Session = Depends(get_db), current_user: schema.UserResponse = Depends(oauth.get_current_user)):
-    return blog.create_blog(request, db, current_user)
+    return blog.create_blog(current_user.id, request, db)
 
 
 @router.get('/{id}', status_code=200, response_model=schema.BlogResponse)
-def show(id,response:Response,db:Session=Depends(get_db)):
-    return blog.get_blog_by_id(id,db)
+async def show(id:int,request:Request,response:Response,db=Depends(database.get_read_db)):
+    etag = conditional.entity_etag(await conditional.table_etag(request, 'blog', db), id)
+    if unchanged := conditional.not_modified(request, etag, exists=False):
+        return unchanged
+    item = await run_repo(blog.get_blog_by_id, blog.get_blog_by_id_async, id, db=db)
+    response.headers.update(conditional.etag_headers(etag))
+    return conditional.not_modified(request, etag) or item
 
 @router.delete('/{id}',status_code=status.HTTP_204_NO_CONTENT)
 def delete_blog(id,db:Session=Depends(database.get_db), current_user: schema.UserResponse = Depends(oauth.get_current_user)):
@@ -0,0 +1,17 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from .. import schema, database, pagination
+
+from ..repo import changes
+from ..repo.common import run_repo
+
+router=APIRouter(
+    tags=["CHANGES"]
+)
+
+
+# Delta sync: rows created/updated since the cursor plus tombstones for
+# deletions. Call without since to get the current cursor.
+@router.get('/changes', response_model=schema.ChangeFeed)
+async def show_changes(since:str | None=None, entity:Literal[tuple(changes.ENTITIES)] | None=None, limit:int=Query(pagination.DEFAULT_LIMIT, ge=1, le=pagination.MAX_LIMIT), db=Depends(database.get_read_db)):
+    return await run_repo(changes.get_changes, changes.get_changes_async, since=since, entity=entity, limit=limit, db=db)
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends ,Response,status,HTTPException,Request
+from fastapi import APIRouter, Depends ,Response,status,HTTPException,Request,Query
 from sqlalchemy.orm import Session
-from .. import schema, database,oauth, token
+from .. import schema, database, conditional,oauth, token, pagination, serializers, streaming
 
 
 
 from typing import List
 from ..repo import event
+from ..repo.common import run_repo
 
 get_db=database.get_db
 
@@ -16,9 +17,19 @@ router=APIRouter(
 )
 
 
-@router.get('/')
-def show_all(db:Session=Depends(get_db)):
-    return event.get_all(db)
+# Fields a list request may ask for with ?fields=
+LIST_FIELDS = ('id', 'name', 'description', 'location', 'date', 'image_url')
+
+
+@router.get('/', response_model=schema.Page[schema.Event])
+async def show_all(request:Request, limit:int=Query(pagination.DEFAULT_LIMIT, ge=1, le=pagination.MAX_LIMIT), cursor:str | None=None, stream:bool=False, fields=Depends(serializers.fields_query(LIST_FIELDS)), db=Depends(database.get_read_db)):
+    if streaming.requested(request, stream):
+        return streaming.ndjson_response(event.list_rows.project(fields), request, cursor)
+    return await conditional.cached_response(
+        request, 'events', f'limit={limit}&cursor={cursor or ""}&fields={",".join(fields or ())}',
+        lambda session: run_repo(event.get_all, event.get_all_async, limit=limit, cursor=cursor, fields=fields, db=session),
+        db,
+    )
 
 
 @router.post('/')
@@ -27,8 +38,13 @@ def create(request: schema.Event, db: Session = Depends(get_db), current_user: s
 
 
 @router.get('/{id}', status_code=200, response_model=schema.EventResponse)
-def show(id,response:Response,db:Session=Depends(get_db)):
-    return event.get_event_by_id(id,db)
+async def show(id:int,request:Request,response:Response,db=Depends(database.get_read_db)):
+    etag = conditional.entity_etag(await conditional.table_etag(request, 'events', db), id)
+    if unchanged := conditional.not_modified(request, etag, exists=False):
+        return unchanged
+    item = await run_repo(event.get_event_by_id, event.get_event_by_id_async, id, db=db)
+    response.headers.update(conditional.etag_headers(etag))
+    return conditional.not_modified(request, etag) or item
 
 
 @router.delete('/{id}',status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,48 @@
+import asyncio
+from fastapi import APIRouter, Depends, Query, Request
+from .. import schema, database, pagination, cache, conditional
+
+from ..repo import program, service, event, blog
+from ..repo.common import run_repo
+
+router=APIRouter(
+    tags=["HOME"]
+)
+
+# Section name -> first-page loaders of its list route
+SECTIONS = {
+    "programs": (program.show_programs, program.show_programs_async),
+    "services": (service.get_all, service.get_all_async),
+    "events": (event.get_all, event.get_all_async),
+    "blog": (blog.get_all, blog.get_all_async),
+}
+
+async def load_section(name: str, limit: int, primary: bool):
+    # Own session per section so the queries can run at the same time
+    sync_fn, async_fn = SECTIONS[name]
+    async with database.read_session(primary) as db:
+        return await run_repo(sync_fn, async_fn, limit=limit, db=db)
+
+
+async def load_home(limits: dict, primary: bool):
+    pages = await asyncio.gather(*(load_section(name, limit, primary) for name, limit in limits.items()))
+    pages = dict(zip(limits, pages))
+    return {name: pages.get(name) for name in SECTIONS}
+
+
+# Everything the home page renders in one response. Each section takes a
+# limit; 0 leaves it out, and with no parameters every section is included.
+@router.get('/home', response_model=schema.Home)
+async def show_home(request:Request, programs:int | None=Query(None, ge=0, le=pagination.MAX_LIMIT), services:int | None=Query(None, ge=0, le=pagination.MAX_LIMIT), events:int | None=Query(None, ge=0, le=pagination.MAX_LIMIT), blog:int | None=Query(None, ge=0, le=pagination.MAX_LIMIT), db=Depends(database.get_read_db)):
+    requested = {"programs": programs, "services": services, "events": events, "blog": blog}
+    if all(limit is None for limit in requested.values()):
+        requested = dict.fromkeys(requested, pagination.DEFAULT_LIMIT)
+    limits = {name: limit for name, limit in requested.items() if limit}
+
+    primary = database.pinned_to_primary(request)
+    return await conditional.cached_response(
+        request, 'home', '&'.join(f'{name}={limit}' for name, limit in limits.items()),
+        lambda session: load_home(limits, primary),
+        db,
+        stale_ttl=cache.HOMEPAGE_CACHE_STALE_TTL, beta=cache.HOMEPAGE_CACHE_XFETCH_BETA,
+    )
@@ -0,0 +1,12 @@
+import os
+from fastapi import APIRouter
+from .. import metrics
+
+router=APIRouter(
+    tags=["METRICS"]
+)
+
+
+@router.get('/metrics')
+def show_metrics():
+    return {"pid": os.getpid(), **metrics.snapshot()}
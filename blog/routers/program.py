@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends,status,HTTPException
+from fastapi import APIRouter, Depends,status,HTTPException,Query,Request,Response
 from sqlalchemy.orm import Session
-from .. import schema, database, oauth
-from typing import List
+from .. import schema, database, conditional, oauth, pagination, cache, serializers, streaming
 
 from  ..repo import program
+from ..repo.common import run_repo
 get_db=database.get_db
 
 router=APIRouter(
@@ -16,14 +16,30 @@ router=APIRouter(
 def create_program(request:schema.Program,db:Session=Depends(get_db), current_user: schema.UserResponse = Depends(oauth.get_current_user)):
    return program.create_program(request,db,current_user)
 
-@router.get('/',response_model=List[schema.ProgramResponse])
-def show_programs(db:Session=Depends(get_db)):
-   return program.show_programs(db)
+# Fields a list request may ask for with ?fields=
+LIST_FIELDS = ('id', 'name', 'description', 'start_date', 'end_date', 'image_url')
+
+
+@router.get('/',response_model=schema.Page[schema.ProgramResponse])
+async def show_programs(request:Request, limit:int=Query(pagination.DEFAULT_LIMIT, ge=1, le=pagination.MAX_LIMIT), cursor:str | None=None, stream:bool=False, fields=Depends(serializers.fields_query(LIST_FIELDS)), db=Depends(database.get_read_db)):
+   if streaming.requested(request, stream):
+      return streaming.ndjson_response(program.list_rows.project(fields), request, cursor)
+   return await conditional.cached_response(
+       request, 'programs', f'limit={limit}&cursor={cursor or ""}&fields={",".join(fields or ())}',
+       lambda session: run_repo(program.show_programs, program.show_programs_async, limit=limit, cursor=cursor, fields=fields, db=session),
+       db,
+       stale_ttl=cache.HOMEPAGE_CACHE_STALE_TTL, beta=cache.HOMEPAGE_CACHE_XFETCH_BETA,
+   )
 
 
 @router.get('/{id}',response_model=schema.ProgramResponse)
-def show(id,db:Session=Depends(get_db)):
-    return program.get_program_by_id(id,db)
+async def show(id:int,request:Request,response:Response,db=Depends(database.get_read_db)):
+    etag = conditional.entity_etag(await conditional.table_etag(request, 'programs', db), id)
+    if unchanged := conditional.not_modified(request, etag, exists=False):
+        return unchanged
+    item = await run_repo(program.get_program_by_id, program.get_program_by_id_async, id, db=db)
+    response.headers.update(conditional.etag_headers(etag))
+    return conditional.not_modified(request, etag) or item
 
 
 @router.delete('/{id}',status_code=status.HTTP_204_NO_CONTENT)
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends,status
+from fastapi import APIRouter, Depends,status,Query,Request,Response
 from sqlalchemy.orm import Session
-from .. import schema, database, oauth
-from typing import List
+from .. import schema, database, conditional, oauth, pagination, cache, serializers, streaming
 
 from  ..repo import service
+from ..repo.common import run_repo
 get_db=database.get_db
 
 
@@ -13,9 +13,20 @@ router=APIRouter(
     tags=["SERVICES"]
 )
 
-@router.get('/',response_model=List[schema.ServiceResponse])
-def show_services(db:Session=Depends(get_db)):
-   return service.get_all(db)
+# Fields a list request may ask for with ?fields=
+LIST_FIELDS = ('id', 'name', 'description', 'price', 'image_url')
+
+
+@router.get('/',response_model=schema.Page[schema.ServiceResponse])
+async def show_services(request:Request, limit:int=Query(pagination.DEFAULT_LIMIT, ge=1, le=pagination.MAX_LIMIT), cursor:str | None=None, stream:bool=False, fields=Depends(serializers.fields_query(LIST_FIELDS)), db=Depends(database.get_read_db)):
+   if streaming.requested(request, stream):
+      return streaming.ndjson_response(service.list_rows.project(fields), request, cursor)
+   return await conditional.cached_response(
+       request, 'services', f'limit={limit}&cursor={cursor or ""}&fields={",".join(fields or ())}',
+       lambda session: run_repo(service.get_all, service.get_all_async, limit=limit, cursor=cursor, fields=fields, db=session),
+       db,
+       stale_ttl=cache.HOMEPAGE_CACHE_STALE_TTL, beta=cache.HOMEPAGE_CACHE_XFETCH_BETA,
+   )
 
 @router.post('/',response_model=schema.ServiceResponse)
 def create_service(request:schema.ServiceCreate,db:Session=Depends(get_db), current_user: schema.UserResponse = Depends(oauth.get_current_user)):
@@ -23,8 +34,13 @@ def create_service(request:schema.ServiceCreate,db:Session=Depends(get_db), curr
 
 
 @router.get('/{id}',response_model=schema.ServiceResponse)
-def show(id,db:Session=Depends(get_db)):
-    return service.get_service_by_id(id,db)
+async def show(id:int,request:Request,response:Response,db=Depends(database.get_read_db)):
+    etag = conditional.entity_etag(await conditional.table_etag(request, 'services', db), id)
+    if unchanged := conditional.not_modified(request, etag, exists=False):
+        return unchanged
+    item = await run_repo(service.get_service_by_id, service.get_service_by_id_async, id, db=db)
+    response.headers.update(conditional.etag_headers(etag))
+    return conditional.not_modified(request, etag) or item
 
 
 @router.delete('/{id}',status_code=status.HTTP_204_NO_CONTENT)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends,status,HTTPException
+from fastapi import APIRouter, Depends,status,HTTPException,Query,Request,Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from .. import schema, database, models
-from typing import List
-from ..hashing import hash_password
+from .. import schema, database, models, pagination, responses, serializers, streaming
+from ..hashing import hash_password_async
 from  ..repo import user
+from ..repo.common import run_repo
 from .. import oauth
 get_db=database.get_db
 
@@ -19,17 +20,25 @@ router=APIRouter(
 
 
 @router.post('/',response_model=schema.UserResponse)
-def create_user(request:schema.User,db:Session=Depends(get_db)):
-   return user.create_user(request,db)
+async def create_user(request:schema.User,db:Session=Depends(get_db)):
+   hashed_password = await hash_password_async(request.password)
+   return await run_in_threadpool(user.create_user, request, db, hashed_password)
 
-@router.get('/',response_model=List[schema.UserResponse])
-def show_user(db:Session=Depends(get_db)):
-   return user.get_all(db)
+# Fields a list request may ask for with ?fields=
+LIST_FIELDS = ('id', 'name', 'email', 'phone_number', 'role')
+
+
+@router.get('/',response_model=schema.Page[schema.UserResponse])
+async def show_user(request:Request, limit:int=Query(pagination.DEFAULT_LIMIT, ge=1, le=pagination.MAX_LIMIT), cursor:str | None=None, stream:bool=False, fields=Depends(serializers.fields_query(LIST_FIELDS)), db=Depends(database.get_read_db)):
+   if streaming.requested(request, stream):
+      return streaming.ndjson_response(user.list_rows.project(fields), request, cursor)
+   page = await run_repo(user.get_all, user.get_all_async, limit=limit, cursor=cursor, fields=fields, db=db)
+   return Response(responses.dumps(page), media_type="application/json")
 
 
 @router.get('/{id}',response_model=schema.UserResponse)
-def show(id,db:Session=Depends(get_db)):
-    return user.get_user_by_id(id,db)
+async def show(id:int,db=Depends(database.get_read_db)):
+    return await run_repo(user.get_user_by_id, user.get_user_by_id_async, id, db=db)
 
 
 @router.delete('/{id}',status_code=status.HTTP_204_NO_CONTENT)
@@ -37,5 +46,9 @@ def delete_user(id,db:Session=Depends(get_db), current_user: schema.UserResponse
    return user.delete_user(id,db)
 
 @router.put('/{id}',status_code=status.HTTP_202_ACCEPTED)
-def update_user(id,request:schema.User,db:Session=Depends(get_db), current_user: schema.UserResponse = Depends(oauth.get_current_user)):
-    return user.update_user(id,request,db)
+async def update_user(id:int,request:schema.User,db:Session=Depends(get_db), current_user: schema.UserResponse = Depends(oauth.get_current_user)):
+    # Members may only edit their own account; checked before paying for the hash
+    if current_user.id != id and current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to update this user")
+    hashed_password = await hash_password_async(request.password)
+    return await run_in_threadpool(user.update_user, id, request, db, hashed_password, current_user)
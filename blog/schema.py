@@ -1,5 +1,7 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Generic, TypeVar
+
+T = TypeVar("T")
 
 
 class User(BaseModel):
@@ -40,6 +42,38 @@ class BlogResponse(BaseModel):
         from_attributes = True
 
 
+class BlogSummary(BaseModel):
+    # A list item: the stored excerpt instead of the body
+    id: int
+    title: str
+    excerpt: str
+    word_count: int
+    reading_time: int
+    image_url: str | None = None
+    owner: UserResponse
+
+    class Config:
+        from_attributes = True
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: str | None = None
+
+
+class Change(BaseModel):
+    entity: str
+    id: int
+    deleted: bool = False
+    data: dict | None = None   # current row; None for deletions
+
+
+class ChangeFeed(BaseModel):
+    changes: List[Change]
+    next_cursor: str
+    has_more: bool = False
+
+
 class Login(BaseModel):
     username:str
     password:str
@@ -52,6 +86,8 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: str | None = None
+    id: int | None = None
+    role: str | None = None
 
 
 
@@ -68,7 +104,7 @@ class Program(BaseModel):
 
 
 class ProgramResponse(BaseModel):
-   
+    id:int
     name:str
     description:str
     start_date:str
@@ -105,6 +141,7 @@ class Service(BaseModel):
         from_attributes = True
 
 class ServiceResponse(BaseModel):
+    id:int
     name:str
     description:str
     description:str
@@ -158,3 +195,17 @@ class EventResponse(BaseModel):
 
     class Config:
         from_attributes=True
+
+
+class Home(BaseModel):
+    # Sections left out of the request are null
+    programs: Page[ProgramResponse] | None = None
+    services: Page[ServiceResponse] | None = None
+    events: Page[Event] | None = None
+    blog: Page[BlogSummary] | None = None
+
+
+class AdminSummary(BaseModel):
+    counts: dict[str, int]
+    users_by_role: dict[str, int]
+    recent: dict[str, List[dict]]   # newest rows per entity, each with its id
@@ -0,0 +1,95 @@
+import csv
+import io
+import os
+import zlib
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from . import database, pagination, responses
+
+NDJSON = "application/x-ndjson"
+
+# Rows fetched per round trip while streaming; each batch is one chunk
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "100"))
+# Admin exports care about throughput, not time to first byte
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+
+def requested(request: Request, stream: bool = False) -> bool:
+    # ?stream=1 or Accept: application/x-ndjson
+    return stream or NDJSON in request.headers.get("accept", "")
+
+
+def _body(stmt, key_column, encode, cursor: str | None = None, primary: bool = False,
+          batch: int = STREAM_BATCH_SIZE, head: bytes = b"", compressor=None):
+    # Response body: head, then encode(rows) for each batch read off a
+    # server-side cursor, optionally through a zlib compressor. The generator
+    # opens its own session: the request's session may be closed before the
+    # body is sent.
+    def chunk(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    if database.ASYNC_DB:
+        async def body():
+            if head:
+                yield chunk(head)
+            async with database.read_session(primary) as db:
+                async for rows in pagination.stream_rows_async(stmt, key_column, db, cursor, batch):
+                    # Encoding (and compressing) a batch is CPU work; keep it
+                    # off the event loop so other requests aren't held up
+                    yield await run_in_threadpool(lambda: chunk(encode(rows)))
+            if compressor:
+                yield compressor.flush()
+    else:
+        # Sync generator: Starlette iterates it in the thread pool
+        def body():
+            if head:
+                yield chunk(head)
+            with (database.SessionLocal if primary else database.ReadSessionLocal)() as db:
+                for rows in pagination.stream_rows(stmt, key_column, db, cursor, batch):
+                    yield chunk(encode(rows))
+            if compressor:
+                yield compressor.flush()
+
+    return body()
+
+
+def ndjson_response(serializer, request: Request, cursor: str | None = None) -> StreamingResponse:
+    # A whole list as newline-delimited JSON, one object per line, written as
+    # the rows arrive. Decode the cursor now so a bad one is still a 400.
+    pagination.decode_cursor(cursor)
+
+    def encode(rows) -> bytes:
+        return b"".join(responses.dumps(serializer.row(row)) + b"\n" for row in rows)
+
+    body = _body(serializer.select(), serializer.key, encode, cursor, database.pinned_to_primary(request))
+    return StreamingResponse(body, media_type=NDJSON)
+
+
+def _csv(rows) -> bytes:
+    out = io.StringIO()
+    csv.writer(out).writerows(rows)
+    return out.getvalue().encode("utf-8")
+
+
+def _jsonl(rows) -> bytes:
+    return b"".join(responses.dumps(row._asdict()) + b"\n" for row in rows)
+
+
+def export_response(stmt, key_column, filename: str, fmt: str, gzip: bool = False) -> StreamingResponse:
+    # A table download (see routers/admin.py), one batch in memory at a time
+    if fmt == "csv":
+        media_type, encode = "text/csv; charset=utf-8", _csv
+        head = _csv([[column.name for column in stmt.selected_columns]])
+    else:
+        media_type, encode, head = NDJSON, _jsonl, b""
+    filename = f"{filename}.{fmt}"
+    compressor = None
+    if gzip:
+        # wbits=31: gzip container, so the download opens with gunzip
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        media_type, filename = "application/gzip", f"{filename}.gz"
+
+    body = _body(stmt, key_column, encode, batch=EXPORT_BATCH_SIZE, head=head, compressor=compressor)
+    return StreamingResponse(body, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
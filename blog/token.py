@@ -13,6 +13,11 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
 
 
 
+def user_claims(user) -> dict:
+    # Carry the id and role so requests can be authorized without a users lookup
+    return {"sub": user.email, "uid": user.id, "role": user.role}
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     if expires_delta:
@@ -32,7 +37,7 @@ def verify_access_token(token_str: str, credentials_exception):
         username: str | None = payload.get("sub")
         if username is None:
             raise credentials_exception
-        return schema.TokenData(username=username)
+        return schema.TokenData(username=username, id=payload.get("uid"), role=payload.get("role"))
     except JWTError:
         raise credentials_exception
     
\ No newline at end of file
@@ -0,0 +1,43 @@
+import argparse
+import os
+import statistics
+import time
+from dotenv import load_dotenv
+from passlib.context import CryptContext
+
+# Measures bcrypt on this host and prints the highest BCRYPT_ROUNDS that
+# hashes within the latency budget. Run it on the deployment machine.
+load_dotenv()
+
+parser = argparse.ArgumentParser(description="Pick BCRYPT_ROUNDS for a login latency budget")
+parser.add_argument("--budget-ms", type=float, default=float(os.getenv("HASH_LATENCY_BUDGET_MS", "250")))
+parser.add_argument("--samples", type=int, default=3)
+parser.add_argument("--min-rounds", type=int, default=10)
+parser.add_argument("--max-rounds", type=int, default=16)
+args = parser.parse_args()
+
+# Same input shape as hashing.hash_password (a sha256 hex digest)
+secret = "0" * 64
+chosen = None
+
+for rounds in range(args.min_rounds, args.max_rounds + 1):
+    ctx = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=rounds)
+    timings = []
+    for _ in range(args.samples):
+        start = time.perf_counter()
+        ctx.hash(secret)
+        timings.append((time.perf_counter() - start) * 1000)
+    median_ms = statistics.median(timings)
+    print(f"rounds={rounds:2d}  median={median_ms:8.1f} ms")
+
+    if median_ms > args.budget_ms:
+        break
+    chosen = rounds
+
+if chosen is None:
+    print(f"Even {args.min_rounds} rounds exceed {args.budget_ms:.0f} ms; keeping BCRYPT_ROUNDS={args.min_rounds}")
+    chosen = args.min_rounds
+
+print(f"\nAdd to .env (budget {args.budget_ms:.0f} ms):")
+print(f"BCRYPT_ROUNDS={chosen}")
+print("Existing hashes are re-hashed at this cost on each user's next login.")
@@ -6,9 +6,15 @@ const AdminDashboard = (() => {
         services: [],
         news: [],
         events: [],
-        users: []
+        users: [],
+        cursors: {},
+        summary: null,
+        changesCursor: null
     };
 
+    // Tables load page by page; counts come from the server-side summary
+    const PAGE_SIZE = 50;
+
     // Initialize
     const init = async () => {
         // Check auth - require admin role
@@ -21,7 +27,12 @@ const AdminDashboard = (() => {
 
     // Load all data
     const loadAllData = async () => {
+        // Take the change-feed cursor first so edits made while loading are replayed
+        const head = await API.changes.since();
+        state.changesCursor = head.success ? head.data.next_cursor : null;
+
         await Promise.all([
+            loadSummary(),
             loadPrograms(),
             loadServices(),
             loadNews(),
@@ -32,6 +43,76 @@ const AdminDashboard = (() => {
         updateLastUpdated();
     };
 
+    // Apply what changed since the last sync instead of reloading every table
+    const stateKeys = { programs: 'programs', services: 'services', blogs: 'news', events: 'events', users: 'users' };
+
+    const syncChanges = async () => {
+        if (!state.changesCursor) return loadAllData();
+
+        let result;
+        do {
+            result = await API.changes.since(state.changesCursor);
+            if (!result.success) return loadAllData();
+
+            result.data.changes.forEach(change => {
+                const rows = state[stateKeys[change.entity]];
+                if (!rows) return;
+                const index = rows.findIndex(row => row.id === change.id);
+                if (change.deleted) {
+                    if (index !== -1) rows.splice(index, 1);
+                } else if (index !== -1) {
+                    rows[index] = { ...change.data, id: change.id };
+                } else {
+                    rows.push({ ...change.data, id: change.id });
+                }
+            });
+            state.changesCursor = result.data.next_cursor;
+        } while (result.data.has_more);
+
+        renderProgramsTable();
+        renderServicesTable();
+        renderNewsTable();
+        renderEventsTable();
+        renderUsersTable();
+        await loadSummary();
+        updateStats();
+        updateLastUpdated();
+    };
+
+    const loadSummary = async () => {
+        const result = await API.admin.summary();
+        if (result.success) {
+            state.summary = result.data;
+        }
+    };
+
+    // Load the first page of a table, or append the next one
+    const loadPage = async (key, endpoint, render, append = false) => {
+        const result = await API.getPage(endpoint, append ? state.cursors[key] : null, PAGE_SIZE);
+        if (result.success) {
+            if (append) {
+                // Rows added by syncChanges may already be in the table
+                const ids = new Set(state[key].map(row => row.id));
+                state[key].push(...result.data.items.filter(row => !ids.has(row.id)));
+            } else {
+                state[key] = result.data.items;
+            }
+            state.cursors[key] = result.data.next_cursor;
+            render();
+        }
+    };
+
+    const loadMoreRow = (key, colspan) => {
+        if (!state.cursors[key]) return '';
+        return `
+            <tr>
+                <td colspan="${colspan}" class="px-6 py-4 text-center">
+                    <button class="text-blue-600 hover:underline font-semibold text-sm" onclick="AdminDashboard.loadMore('${key}')">Load more</button>
+                </td>
+            </tr>
+        `;
+    };
+
     const updateLastUpdated = () => {
         const el = document.querySelector('.text-sm.bg-white\\/80');
         if (el) {
@@ -40,13 +121,7 @@ const AdminDashboard = (() => {
     };
 
     // --- Programs ---
-    const loadPrograms = async () => {
-        const result = await API.programs.getAll();
-        if (result.success) {
-            state.programs = result.data;
-            renderProgramsTable();
-        }
-    };
+    const loadPrograms = (append = false) => loadPage('programs', '/programs/', renderProgramsTable, append);
 
     const renderProgramsTable = () => {
         const tbody = document.querySelector('#programs tbody');
@@ -69,6 +144,7 @@ const AdminDashboard = (() => {
                 </td>
             </tr>
         `).join('') || '<tr><td colspan="5" class="px-6 py-4 text-center text-slate-500">No programs found</td></tr>';
+        tbody.innerHTML += loadMoreRow('programs', 5);
     };
 
     const handleProgramSubmit = async (e) => {
@@ -104,8 +180,7 @@ const AdminDashboard = (() => {
                 closeModal('programModal');
                 form.reset();
                 delete form.dataset.editId; // Clear edit mode
-                await loadPrograms();
-                updateStats();
+                await syncChanges();
             } else {
                 Toast.error(result.error || 'Failed to save program');
             }
@@ -119,13 +194,7 @@ const AdminDashboard = (() => {
     };
 
     // --- Services ---
-    const loadServices = async () => {
-        const result = await API.services.getAll();
-        if (result.success) {
-            state.services = result.data;
-            renderServicesTable();
-        }
-    };
+    const loadServices = (append = false) => loadPage('services', '/services/', renderServicesTable, append);
 
     const renderServicesTable = () => {
         const tbody = document.querySelector('#services tbody');
@@ -148,6 +217,7 @@ const AdminDashboard = (() => {
                 </td>
             </tr>
         `).join('') || '<tr><td colspan="5" class="px-6 py-4 text-center text-slate-500">No services found</td></tr>';
+        tbody.innerHTML += loadMoreRow('services', 5);
     };
 
     const handleServiceSubmit = async (e) => {
@@ -179,8 +249,7 @@ const AdminDashboard = (() => {
                 closeModal('serviceModal');
                 form.reset();
                 delete form.dataset.editId;
-                await loadServices();
-                updateStats();
+                await syncChanges();
             } else {
                 Toast.error(result.error || 'Failed to save service');
             }
@@ -194,13 +263,7 @@ const AdminDashboard = (() => {
     };
 
     // --- News (Blog) ---
-    const loadNews = async () => {
-        const result = await API.blog.getAll();
-        if (result.success) {
-            state.news = result.data;
-            renderNewsTable();
-        }
-    };
+    const loadNews = (append = false) => loadPage('news', '/blog/', renderNewsTable, append);
 
     const renderNewsTable = () => {
         const tbody = document.querySelector('#news tbody');
@@ -221,6 +284,7 @@ const AdminDashboard = (() => {
                 </td>
             </tr>
         `).join('') || '<tr><td colspan="5" class="px-6 py-4 text-center text-slate-500">No news articles found</td></tr>';
+        tbody.innerHTML += loadMoreRow('news', 5);
     };
 
     const handleNewsSubmit = async (e) => {
@@ -251,8 +315,7 @@ const AdminDashboard = (() => {
                 closeModal('newsModal');
                 form.reset();
                 delete form.dataset.editId;
-                await loadNews();
-                updateStats();
+                await syncChanges();
             } else {
                 Toast.error(result.error || 'Failed to save news');
             }
@@ -266,13 +329,7 @@ const AdminDashboard = (() => {
     };
 
     // --- Events ---
-    const loadEvents = async () => {
-        const result = await API.events.getAll();
-        if (result.success) {
-            state.events = result.data;
-            renderEventsTable();
-        }
-    };
+    const loadEvents = (append = false) => loadPage('events', '/event/', renderEventsTable, append);
 
     const renderEventsTable = () => {
         const tbody = document.querySelector('#events tbody');
@@ -292,6 +349,7 @@ const AdminDashboard = (() => {
                 </td>
             </tr>
         `).join('') || '<tr><td colspan="4" class="px-6 py-4 text-center text-slate-500">No events found</td></tr>';
+        tbody.innerHTML += loadMoreRow('events', 4);
     };
 
     const handleEventSubmit = async (e) => {
@@ -324,8 +382,7 @@ const AdminDashboard = (() => {
                 closeModal('eventModal');
                 form.reset();
                 delete form.dataset.editId;
-                await loadEvents();
-                updateStats();
+                await syncChanges();
             } else {
                 Toast.error(result.error || 'Failed to save event');
             }
@@ -339,13 +396,7 @@ const AdminDashboard = (() => {
     };
 
     // --- Users ---
-    const loadUsers = async () => {
-        const result = await API.users.getAll();
-        if (result.success) {
-            state.users = result.data;
-            renderUsersTable();
-        }
-    };
+    const loadUsers = (append = false) => loadPage('users', '/user/', renderUsersTable, append);
 
     const renderUsersTable = () => {
         const tbody = document.querySelector('#users tbody');
@@ -368,6 +419,7 @@ const AdminDashboard = (() => {
                 </td>
             </tr>
         `).join('');
+        tbody.innerHTML += loadMoreRow('users', 6);
     };
 
 
@@ -383,7 +435,9 @@ const AdminDashboard = (() => {
             item = state.services.find(s => s.id === id);
             modalId = 'serviceModal';
         } else if (type === 'blog') {
-            item = state.news.find(n => n.id === id);
+            // List items only carry the excerpt; fetch the post for its body
+            const result = await API.blog.getById(id);
+            item = result.success ? result.data : null;
             modalId = 'newsModal';
         } else if (type === 'events') {
             item = state.events.find(e => e.id === id);
@@ -453,27 +507,41 @@ const AdminDashboard = (() => {
 
         if (result && result.success) {
             Toast.success('Item deleted');
-            // Reload data
-            if (type === 'programs') await loadPrograms();
-            else if (type === 'services') await loadServices();
-            else if (type === 'blog') await loadNews();
-            else if (type === 'events') await loadEvents();
-            else if (type === 'users') await loadUsers();
-            updateStats();
+            await syncChanges();
         } else {
             Toast.error('Failed to delete item');
         }
     };
 
     const updateStats = () => {
-        // Simple counters based on loaded data
+        // Totals from /admin/summary; the tables only hold the pages loaded so far
+        const counts = state.summary?.counts;
         const stats = document.querySelectorAll('.text-4xl.font-bold');
         if (stats.length >= 4) {
-            stats[0].textContent = state.users.length; // Members
-            stats[1].textContent = state.programs.length; // Programs
-            stats[2].textContent = state.services.length; // Services
-            stats[3].textContent = state.news.length; // Posts
+            stats[0].textContent = counts ? counts.users : state.users.length; // Members
+            stats[1].textContent = counts ? counts.programs : state.programs.length; // Programs
+            stats[2].textContent = counts ? counts.services : state.services.length; // Services
+            stats[3].textContent = counts ? counts.blogs : state.news.length; // Posts
+        }
+    };
+
+    const loadMore = (key) => {
+        const loaders = { programs: loadPrograms, services: loadServices, news: loadNews, events: loadEvents, users: loadUsers };
+        return loaders[key](true);
+    };
+
+    // --- Export ---
+    const exportTable = async (entity, format = 'csv') => {
+        const result = await API.admin.export(entity, format);
+        if (!result.success) {
+            Toast.error(result.error || 'Export failed');
+            return;
         }
+        const link = document.createElement('a');
+        link.href = URL.createObjectURL(result.data);
+        link.download = result.filename || `${entity}.${format}`;
+        link.click();
+        setTimeout(() => URL.revokeObjectURL(link.href), 1000);
     };
 
     const setupEventListeners = () => {
@@ -494,7 +562,9 @@ const AdminDashboard = (() => {
     return {
         init,
         editItem,
-        deleteItem
+        deleteItem,
+        loadMore,
+        exportTable
     };
 })();
 
@@ -99,6 +99,38 @@ const API = (() => {
         return request('GET', endpoint, null, options);
     };
 
+    // GET every page of a cursor-paginated list endpoint.
+    // fields: optional list of item fields to fetch (?fields=)
+    const getAllPages = async (endpoint, limit = 200, fields = null) => {
+        const items = [];
+        let cursor = null;
+
+        do {
+            const query = new URLSearchParams({ limit });
+            if (cursor) query.append('cursor', cursor);
+            if (fields) query.append('fields', fields.join(','));
+
+            const result = await get(`${endpoint}?${query}`);
+            if (!result.success) return result;
+
+            items.push(...(result.data?.items || []));
+            cursor = result.data?.next_cursor;
+        } while (cursor);
+
+        return {
+            success: true,
+            data: items,
+            status: 200
+        };
+    };
+
+    // GET one page of a cursor-paginated list endpoint
+    const getPage = (endpoint, cursor = null, limit = 50) => {
+        const query = new URLSearchParams({ limit });
+        if (cursor) query.append('cursor', cursor);
+        return get(`${endpoint}?${query}`);
+    };
+
     // POST request
     const post = (endpoint, data, options = {}) => {
         return request('POST', endpoint, data, options);
@@ -188,7 +220,7 @@ const API = (() => {
 
     // ===================== USERS =====================
     const users = {
-        getAll: () => get('/user/'),
+        getAll: () => getAllPages('/user/'),
         getById: (id) => get(`/user/${id}`),
         create: (data) => post('/user/', data),
         update: (id, data) => put(`/user/${id}`, data),
@@ -197,7 +229,7 @@ const API = (() => {
 
     // ===================== PROGRAMS =====================
     const programs = {
-        getAll: () => get('/programs/'),
+        getAll: () => getAllPages('/programs/'),
         getById: (id) => get(`/programs/${id}`),
         create: (data) => post('/programs/', data),
         update: (id, data) => put(`/programs/${id}`, data),
@@ -206,7 +238,7 @@ const API = (() => {
 
     // ===================== SERVICES =====================
     const services = {
-        getAll: () => get('/services/'),
+        getAll: () => getAllPages('/services/'),
         getById: (id) => get(`/services/${id}`),
         create: (data) => post('/services/', data),
         update: (id, data) => put(`/services/${id}`, data),
@@ -215,7 +247,7 @@ const API = (() => {
 
     // ===================== EVENTS =====================
     const events = {
-        getAll: () => get('/event/'),
+        getAll: () => getAllPages('/event/'),
         getById: (id) => get(`/event/${id}`),
         create: (data) => post('/event/', data),
         update: (id, data) => put(`/event/${id}`, data),
@@ -224,17 +256,51 @@ const API = (() => {
 
     // ===================== BLOG =====================
     const blog = {
-        getAll: () => get('/blog/'),
+        getAll: (fields = null) => getAllPages('/blog/', 200, fields),
         getById: (id) => get(`/blog/${id}`),
         create: (data) => post('/blog/', data),
         update: (id, data) => put(`/blog/${id}`, data),
         delete: (id) => del(`/blog/${id}`)
     };
 
+    // ===================== HOME =====================
+    // Several list sections in one request, e.g. home({ programs: 4, services: 4 })
+    const home = (limits = {}) => get(`/home?${new URLSearchParams(limits)}`);
+
+    // ===================== ADMIN =====================
+    const admin = {
+        summary: (recent = 5) => get(`/admin/summary?recent=${recent}`),
+        // Whole table as a file: format 'csv' or 'jsonl', gzip for a .gz download
+        export: async (entity, format = 'csv', gzip = false) => {
+            try {
+                const response = await fetch(`${baseURL}/admin/export/${entity}.${format}?gzip=${gzip}`, { headers: getHeaders() });
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                const filename = response.headers.get('Content-Disposition')?.match(/filename="(.+)"/)?.[1];
+                return { success: true, data: await response.blob(), filename, status: response.status };
+            } catch (error) {
+                console.error(`API Error (export ${entity}):`, error);
+                return { success: false, error: error.message, status: null };
+            }
+        }
+    };
+
+    // ===================== CHANGES =====================
+    // Delta feed: call since() without a cursor to get the current one
+    const changes = {
+        since: (cursor = null, entity = null) => {
+            const query = new URLSearchParams({ limit: 200 });
+            if (cursor) query.append('since', cursor);
+            if (entity) query.append('entity', entity);
+            return get(`/changes?${query}`);
+        }
+    };
+
     return {
         baseURL,
         request,
         get,
+        getAllPages,
+        getPage,
         post,
         put,
         patch,
@@ -249,6 +315,9 @@ const API = (() => {
         programs,
         services,
         events,
-        blog
+        blog,
+        home,
+        admin,
+        changes
     };
 })();
@@ -19,6 +19,8 @@ document.querySelectorAll('.animate-on-scroll').forEach(element => {
 
 // Home Page Module
 const HomePage = (() => {
+    let services = [];
+
     const init = async () => {
         console.log('🏠 Home page initialized');
         await loadHomeContent();
@@ -28,16 +30,12 @@ const HomePage = (() => {
     // Load home page content from backend
     const loadHomeContent = async () => {
         try {
-            // Load programs
-            const programsResult = await Data.loadPrograms();
-            if (programsResult.success) {
-                renderPrograms(programsResult.data);
-            }
-
-            // Load services
-            const servicesResult = await Data.loadServices();
-            if (servicesResult.success) {
-                renderServices(servicesResult.data);
+            // Programs and services in one request
+            const result = await API.home({ programs: 4, services: 4 });
+            if (result.success) {
+                services = result.data.services?.items || [];
+                renderPrograms(result.data.programs?.items);
+                renderServices(services);
             }
         } catch (error) {
             console.error('Error loading home content:', error);
@@ -122,7 +120,7 @@ const HomePage = (() => {
         document.querySelectorAll('.service-book-btn').forEach(btn => {
             btn.addEventListener('click', (e) => {
                 const serviceId = e.target.closest('button').dataset.serviceId;
-                const service = Data.getServiceById(serviceId);
+                const service = services.find(s => s.id == serviceId);
                 if (!Auth.requireAuth()) return;
                 showServiceBookingModal(service);
             });
@@ -9,7 +9,8 @@ const NewsPage = (() => {
     // Load news from API
     const loadNews = async () => {
         try {
-            const result = await API.blog.getAll();
+            // The cards don't show the author, so skip it (and the users join)
+            const result = await API.blog.getAll(['id', 'title', 'excerpt', 'reading_time', 'image_url']);
 
             if (result.success) {
                 renderNews(result.data);
@@ -49,10 +50,11 @@ const NewsPage = (() => {
                     <div class="flex items-center gap-2 mb-3">
                         <span class="text-xs font-bold text-[var(--primary-blue)] bg-blue-100 px-3 py-1 rounded-full">News</span>
                         <span class="text-xs text-slate-500">${new Date().toLocaleDateString()}</span> <!-- Placeholder date if not in schema -->
+                        <span class="text-xs text-slate-500">· ${item.reading_time} min read</span>
                     </div>
                     <h3 class="text-xl font-bold text-slate-900 mb-3">${item.title}</h3>
                     <p class="text-slate-600 mb-4 line-clamp-3">
-                        ${item.body}
+                        ${item.excerpt}
                     </p>
                     <a href="#" class="text-[var(--primary-blue)] font-bold hover:underline flex items-center gap-2">Read More <span class="material-symbols-outlined text-sm">arrow_forward</span></a>
                 </div>
@@ -7,8 +7,10 @@ bind = "127.0.0.1:8000"
 backlog = 2048
 
 # Worker processes
-# Formula: (2 x $num_cores) + 1
-workers = multiprocessing.cpu_count() * 2 + 1
+# Formula: (2 x $num_cores) + 1, overridable with WEB_CONCURRENCY
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Workers size their DB pools from this (see blog/database.py)
+os.environ["WEB_CONCURRENCY"] = str(workers)
 worker_class = "uvicorn.workers.UvicornWorker"
 worker_connections = 1000
 timeout = 30
@@ -0,0 +1,68 @@
+import os
+import tempfile
+
+# blog.database and blog.main read these at import time
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["HASH_POOL_WORKERS"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["CACHE_BACKEND"] = "none"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from blog import cache, database, models, oauth
+from blog.main import app
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    # Every test starts with empty tables and empty caches
+    with database.engine.begin() as conn:
+        for table in reversed(models.Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    cache.response_cache.clear()
+    oauth._user_cache.clear()
+    yield
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def db():
+    session = database.SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def queries():
+    # SQL statements run against the engines while the test is active
+    statements = []
+    engines = [database.engine]
+    if database.async_engine is not None:
+        engines.append(database.async_engine.sync_engine)
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def register(client):
+    # register(email) -> auth headers for a new member account
+    def register(email="member@example.com", password="pw", name="Member") -> dict:
+        response = client.post("/register", json={"name": name, "email": email, "password": password})
+        assert response.status_code == 201, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return register
@@ -0,0 +1,85 @@
+import base64
+
+from sqlalchemy import select
+
+from blog import cache, models, pagination
+
+
+def add_posts(db, count: int, user_id: int):
+    db.add_all(models.Blog(title=f"Post {i}", body="x" * 50, user_id=user_id) for i in range(count))
+    db.commit()
+    # Rows added behind the API's back
+    cache.invalidate("blog")
+
+
+def owner(db) -> models.User:
+    user = models.User(name="Owner", email="owner@example.com", password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_blog_list_query_count_does_not_grow_with_rows(client, db, queries):
+    user = owner(db)
+    add_posts(db, 1, user.id)
+    queries.clear()
+    assert len(client.get("/blog/").json()["items"]) == 1
+    one_row = len(queries)
+
+    add_posts(db, 20, user.id)
+    queries.clear()
+    items = client.get("/blog/").json()["items"]
+    assert len(items) == 21
+    assert all(item["owner"]["name"] == "Owner" for item in items)
+    assert len(queries) == one_row
+
+
+def test_blog_detail_loads_owner_in_the_same_query(client, db, queries):
+    user = owner(db)
+    add_posts(db, 1, user.id)
+    post_id = db.query(models.Blog.id).scalar()
+    client.get(f"/blog/{post_id}")  # fills the ETag counters
+    queries.clear()
+
+    response = client.get(f"/blog/{post_id}")
+    assert response.json()["owner"]["email"] == "owner@example.com"
+    assert len([sql for sql in queries if "FROM blogs" in sql]) == 1
+    assert len(queries) == 1
+
+
+def test_create_blog_belongs_to_the_current_user(client, register):
+    headers = register(email="author@example.com", name="Author")
+    response = client.post("/blog/", json={"title": "Hello", "body": "one two three"}, headers=headers)
+    assert response.status_code == 201, response.text
+
+    post = client.get(f"/blog/{response.json()['id']}").json()
+    assert post["owner"]["email"] == "author@example.com"
+    items = client.get("/blog/").json()["items"]
+    assert [(item["title"], item["word_count"]) for item in items] == [("Hello", 3)]
+
+
+def test_blog_list_pages_to_the_end_by_cursor(client, db):
+    add_posts(db, 5, owner(db).id)
+    ids, cursor = [], None
+    while True:
+        page = client.get("/blog/", params={"limit": 2, **({"cursor": cursor} if cursor else {})}).json()
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert ids == sorted(db.scalars(select(models.Blog.id)))
+
+
+def test_blog_list_rejects_bad_cursors(client):
+    def encoded(raw: bytes) -> str:
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    tampered = [encoded(b'{"id":"1 OR 1=1"}'), encoded(b'{"page":2}'), encoded(b"[1]")]
+    for cursor in ["not-a-cursor", pagination.encode_cursor(1)[:-3], *tampered]:
+        assert client.get("/blog/", params={"cursor": cursor}).status_code == 400, cursor
+
+
+def test_blog_list_limit_bounds(client):
+    assert client.get("/blog/", params={"limit": 0}).status_code == 422
+    assert client.get("/blog/", params={"limit": pagination.MAX_LIMIT + 1}).status_code == 422
+    assert client.get("/blog/", params={"limit": pagination.MAX_LIMIT}).status_code == 200
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from blog import cache, database
+
+
+def test_fill_from_a_lagging_replica_is_not_stored(monkeypatch):
+    monkeypatch.setattr(database, "READ_DATABASE_URL", "sqlite:///replica.db")
+
+    async def produce():
+        return b"read from the replica"
+
+    cache.invalidate("programs")
+    asyncio.run(cache.cached_bytes("programs", "list", produce))
+    assert cache.response_cache.get("programs:list") is None
+
+    monkeypatch.setattr(database, "REPLICA_LAG_SECONDS", 0)
+    asyncio.run(cache.cached_bytes("programs", "list", produce))
+    assert cache.response_cache.get("programs:list") is not None
+
+
+def test_concurrent_misses_share_one_fill():
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"value"
+
+    async def burst():
+        return await asyncio.gather(*(cache.cached_bytes("programs", "list", produce) for _ in range(10)))
+
+    assert asyncio.run(burst()) == [b"value"] * 10
+    assert len(calls) == 1
+
+
+def test_a_failed_fill_reaches_every_waiter_and_is_not_stored():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database down")
+
+    async def burst():
+        return await asyncio.gather(*(cache.cached_bytes("programs", "list", fail) for _ in range(3)),
+                                    return_exceptions=True)
+
+    assert [type(result) for result in asyncio.run(burst())] == [RuntimeError] * 3
+    assert cache.response_cache.get("programs:list") is None
+
+
+def test_waits_for_another_workers_fill(monkeypatch):
+    # Another worker holds the shared fill lock and stores the value shortly
+    shared = cache.MemoryBackend(16)
+    monkeypatch.setattr(cache, "response_cache", cache.TieredCache(cache.LocalCache(16), shared))
+    monkeypatch.setattr(cache, "SINGLE_FLIGHT_POLL_INTERVAL", 0.01)
+    assert shared.acquire("programs:list", 5)
+
+    async def produce():
+        raise AssertionError("the other worker is already filling this key")
+
+    async def other_worker():
+        await asyncio.sleep(0.05)
+        shared.set("programs:list", cache._pack(b"from the other worker", 60, 0), 60)
+
+    async def run():
+        waiter = cache.cached_bytes("programs", "list", produce)
+        return (await asyncio.gather(waiter, other_worker()))[0]
+
+    assert asyncio.run(run()) == b"from the other worker"
+
+
+@pytest.fixture
+def redis_backend():
+    fakeredis = pytest.importorskip("fakeredis")
+    backend = cache.RedisBackend("redis://localhost:6379/0")
+    backend.client = fakeredis.FakeRedis()
+    return backend
+
+
+def test_redis_index_outlives_every_key(redis_backend):
+    # A short-lived entry written after a long-lived one must not shorten the
+    # index, or invalidate() would miss the long-lived key
+    redis_backend.set("blogs:list", b"long", 300)
+    redis_backend.set("blogs:etag", b"short", 1)
+    index = redis_backend._index("blogs")
+    assert redis_backend.client.pttl(index) > 299_000
+
+    redis_backend.invalidate("blogs")
+    assert redis_backend.get("blogs:list") is None
+    assert redis_backend.generation("blogs") == 1
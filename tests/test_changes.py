@@ -0,0 +1,53 @@
+PROGRAM = {"name": "Program", "description": "d", "start_date": "2026-01-01", "end_date": "2026-02-01"}
+
+
+def test_changes_match_list_rows_and_report_deletions(client, register):
+    headers = register()
+    head = client.get("/changes").json()
+    assert head["changes"] == []
+
+    kept, removed = (client.post("/programs/", json=PROGRAM, headers=headers).json()["id"] for _ in range(2))
+    client.put(f"/programs/{kept}", json={**PROGRAM, "name": "Renamed"}, headers=headers)
+    assert client.delete(f"/programs/{removed}", headers=headers).status_code == 204
+
+    feed = client.get("/changes", params={"since": head["next_cursor"]}).json()
+    by_id = {change["id"]: change for change in feed["changes"]}
+    assert set(by_id) == {kept, removed}
+    assert by_id[removed]["deleted"] is True
+
+    # The dashboard merges changes into its lists by id
+    listed = {item["id"]: item for item in client.get("/programs/").json()["items"]}
+    assert set(listed) == {kept}
+    assert by_id[kept]["data"] == listed[kept]
+    assert by_id[kept]["data"]["name"] == "Renamed"
+
+    assert client.get("/changes", params={"since": feed["next_cursor"]}).json()["changes"] == []
+
+
+def test_changes_cursor_pages_and_rejects_tampering(client, register):
+    headers = register()
+    since = client.get("/changes").json()["next_cursor"]
+    created = [client.post("/programs/", json=PROGRAM, headers=headers).json()["id"] for _ in range(3)]
+
+    seen = []
+    while True:
+        feed = client.get("/changes", params={"since": since, "entity": "programs", "limit": 2}).json()
+        seen += [change["id"] for change in feed["changes"]]
+        since = feed["next_cursor"]
+        if not feed["has_more"]:
+            break
+    assert seen == created
+
+    assert client.get("/changes", params={"since": "not-a-cursor"}).status_code == 400
+
+
+def test_update_is_one_write_one_counter_update_one_log_insert(client, register, queries):
+    headers = register()
+    program_id = client.post("/programs/", json=PROGRAM, headers=headers).json()["id"]
+    queries.clear()
+
+    assert client.put(f"/programs/{program_id}", json=PROGRAM, headers=headers).status_code == 202
+    writes = [" ".join(sql.split()[:3]) for sql in queries if sql.startswith(("UPDATE", "INSERT", "DELETE"))]
+    assert writes == ["UPDATE programs SET", "UPDATE table_versions SET", "INSERT INTO change_log"]
+
+    assert client.put("/programs/12345", json=PROGRAM, headers=headers).status_code == 404
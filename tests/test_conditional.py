@@ -0,0 +1,71 @@
+import time
+
+from blog import cache, database, models
+from blog.repo.common import record_changes
+
+
+def add_program(db, name: str):
+    # A write made by another worker: the versions move, this worker's cache isn't told
+    program = models.Program(name=name, description="d", start_date="a", end_date="b", user_id=1)
+    db.add(program)
+    db.flush()
+    record_changes(db, models.Program, [program.id])
+    db.commit()
+
+
+def test_list_etag_describes_the_body_it_is_sent_with(client, db):
+    add_program(db, "first")
+    first = client.get("/programs/")
+    assert first.status_code == 200
+
+    add_program(db, "second")
+    stale = client.get("/programs/")
+    assert stale.content == first.content
+    assert stale.headers["etag"] == first.headers["etag"]
+
+    # Once the body is refreshed, revalidating with the old ETag gets the new list
+    cache.response_cache.clear()
+    fresh = client.get("/programs/", headers={"If-None-Match": stale.headers["etag"]})
+    assert fresh.status_code == 200
+    assert [item["name"] for item in fresh.json()["items"]] == ["first", "second"]
+    assert fresh.headers["etag"] != first.headers["etag"]
+
+    assert client.get("/programs/", headers={"If-None-Match": fresh.headers["etag"]}).status_code == 304
+
+
+def test_cached_list_revalidates_without_the_database(client, db, queries):
+    add_program(db, "first")
+    etag = client.get("/programs/").headers["etag"]
+    # Separately cached counters would expire on their own schedule
+    cache.response_cache.local._entries.pop("programs:etag", None)
+    queries.clear()
+
+    assert client.get("/programs/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/programs/").headers["etag"] == etag
+    assert queries == []
+
+
+def test_client_pinned_to_primary_sees_its_own_write(client, db):
+    add_program(db, "first")
+    assert client.get("/programs/").status_code == 200
+    add_program(db, "second")
+
+    # The cached list and counters predate the write; a pinned client skips them
+    client.cookies.set(database.PRIMARY_PIN_COOKIE, str(time.time() + 60))
+    pinned = client.get("/programs/")
+    assert [item["name"] for item in pinned.json()["items"]] == ["first", "second"]
+    client.cookies.clear()
+    assert [item["name"] for item in client.get("/programs/").json()["items"]] == ["first"]
+
+
+def test_weak_etags_match(client, db):
+    add_program(db, "first")
+    etag = client.get("/programs/").headers["etag"]
+    assert client.get("/programs/", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+
+def test_star_matches_only_existing_rows(client, db):
+    add_program(db, "first")
+    program_id = db.query(models.Program.id).scalar()
+    assert client.get(f"/programs/{program_id}", headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get("/programs/12345", headers={"If-None-Match": "*"}).status_code == 404
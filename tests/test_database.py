@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+def pool_budget(**env) -> tuple[int, str]:
+    # Pool defaults are computed at import, so read them in a fresh interpreter
+    env = {**os.environ, "ASYNC_DB": "false", "DB_POOL_SIZE": "", "DB_MAX_OVERFLOW": "", **env}
+    for name in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW"):
+        if not env[name]:
+            del env[name]
+    result = subprocess.run(
+        [sys.executable, "-c", "from blog import database as d; print(d.DB_POOL_SIZE + d.DB_MAX_OVERFLOW)"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return int(result.stdout), result.stderr
+
+
+def test_sync_and_async_engines_share_the_worker_budget():
+    pytest.importorskip("aiosqlite")
+    sync_only, _ = pool_budget(WEB_CONCURRENCY="4", DB_MAX_CONNECTIONS="50", DB_RESERVED_CONNECTIONS="10")
+    both, _ = pool_budget(WEB_CONCURRENCY="4", DB_MAX_CONNECTIONS="50", DB_RESERVED_CONNECTIONS="10", ASYNC_DB="true")
+    assert sync_only == 10
+    assert both == 5
+
+
+def test_budget_too_small_for_the_workers_warns():
+    per_engine, stderr = pool_budget(WEB_CONCURRENCY="8", DB_MAX_CONNECTIONS="12", DB_RESERVED_CONNECTIONS="10")
+    assert per_engine == 1
+    assert "DB_MAX_CONNECTIONS=12" in stderr
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.mark.parametrize("prefix", ["/blog", "/event", "/programs", "/services", "/user"])
+def test_detail_routes_reject_non_integer_ids(client, prefix):
+    assert client.get(f"{prefix}/abc").status_code == 422
+    assert client.get(f"{prefix}/12345").status_code == 404
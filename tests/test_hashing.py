@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+
+
+def hash_pool(**env) -> tuple[int, int]:
+    # (HASH_POOL_WORKERS default, CPU cores), read in a fresh interpreter
+    env = {key: value for key, value in {**os.environ, **env}.items() if key != "HASH_POOL_WORKERS"}
+    result = subprocess.run(
+        [sys.executable, "-c",
+         "import multiprocessing; from blog import hashing; "
+         "print(hashing.HASH_POOL_WORKERS, multiprocessing.cpu_count())"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    workers, cores = map(int, result.stdout.split())
+    return workers, cores
+
+
+def test_hash_pool_shares_the_cores_between_workers():
+    workers, cores = hash_pool(WEB_CONCURRENCY="1")
+    assert workers == cores
+    workers, _ = hash_pool(WEB_CONCURRENCY=str(cores + 1))
+    assert workers == 1
@@ -0,0 +1,56 @@
+import pytest
+
+PROGRAM = {"name": "Program", "description": "d", "start_date": "2026-01-01", "end_date": "2026-02-01"}
+SERVICE = {"name": "Service", "description": "d", "price": 10.0}
+
+
+def all_pages(client, path: str, limit: int) -> list[dict]:
+    # Follow next_cursor the way the admin dashboard's "Load more" does
+    items, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        page = client.get(path, params=params).json()
+        items += page["items"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+@pytest.mark.parametrize("path, body", [("/programs/", PROGRAM), ("/services/", SERVICE)])
+def test_list_items_carry_their_ids_across_pages(client, register, path, body):
+    headers = register()
+    created = [client.post(path, json=body, headers=headers).json()["id"] for _ in range(5)]
+
+    items = all_pages(client, path, limit=2)
+    assert [item["id"] for item in items] == created
+
+
+def test_fields_selects_only_the_requested_columns(client, register, queries):
+    client.post("/programs/", json={**PROGRAM, "image_url": "a.png"}, headers=register())
+    queries.clear()
+
+    items = client.get("/programs/", params={"fields": "name, id"}).json()["items"]
+    assert [set(item) for item in items] == [{"id", "name"}]
+    select_sql = next(sql for sql in queries if "FROM programs" in sql)
+    assert "description" not in select_sql
+
+
+def test_fields_rejects_unknown_names(client):
+    response = client.get("/programs/", params={"fields": "name,password"})
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_home_leaves_out_sections_with_limit_zero(client, register):
+    headers = register()
+    client.post("/programs/", json=PROGRAM, headers=headers)
+    client.post("/services/", json=SERVICE, headers=headers)
+
+    home = client.get("/home", params={"programs": 1, "services": 0}).json()
+    assert [item["name"] for item in home["programs"]["items"]] == ["Program"]
+    assert home["services"] is None
+    # Once any limit is given, sections not named are left out too
+    assert home["events"] is None and home["blog"] is None
+
+    everything = client.get("/home").json()
+    assert all(everything[name] is not None for name in ("programs", "services", "events", "blog"))
@@ -0,0 +1,39 @@
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from blog import database
+from blog.main import PinWritersToPrimary, app as blog_app
+
+
+def pinning_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/read")
+    def read(request: Request):
+        return {"pinned": database.pinned_to_primary(request)}
+
+    @app.post("/write")
+    def write():
+        return {}
+
+    @app.post("/fail")
+    def fail():
+        raise HTTPException(status_code=400)
+
+    app.add_middleware(PinWritersToPrimary)
+    return app
+
+
+def test_successful_writes_pin_the_client_to_the_primary():
+    client = TestClient(pinning_app())
+    assert client.get("/read").json() == {"pinned": False}
+    assert client.post("/fail").status_code == 400
+    assert database.PRIMARY_PIN_COOKIE not in client.cookies
+
+    assert client.post("/write").status_code == 200
+    assert client.get("/read").json() == {"pinned": True}
+
+
+def test_pin_middleware_needs_a_replica():
+    assert database.READ_DATABASE_URL is None
+    assert all(middleware.cls is not PinWritersToPrimary for middleware in blog_app.user_middleware)
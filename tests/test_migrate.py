@@ -0,0 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, inspect
+
+from blog import migrate, models
+
+
+def test_concurrent_workers_migrate_a_fresh_database(tmp_path):
+    # Every gunicorn worker runs the migration when it imports the app
+    engine = create_engine(f"sqlite:///{tmp_path}/fresh.db", connect_args={"timeout": 30})
+    with ThreadPoolExecutor(8) as pool:
+        for future in [pool.submit(migrate.run, engine) for _ in range(8)]:
+            future.result()
+    assert set(models.Base.metadata.tables) <= set(inspect(engine).get_table_names())
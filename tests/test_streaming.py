@@ -0,0 +1,68 @@
+import csv
+import gzip
+import io
+import json
+
+from blog import models
+
+PROGRAM = {"name": "Program", "description": "d", "start_date": "2026-01-01", "end_date": "2026-02-01"}
+
+
+def add_programs(client, headers, count: int) -> list[int]:
+    return [client.post("/programs/", json=PROGRAM, headers=headers).json()["id"] for _ in range(count)]
+
+
+def test_ndjson_stream_writes_one_object_per_line(client, register):
+    ids = add_programs(client, register(), 3)
+
+    for response in (client.get("/programs/", params={"stream": True}),
+                     client.get("/programs/", headers={"Accept": "application/x-ndjson"})):
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = response.text.splitlines()
+        assert [json.loads(line)["id"] for line in lines] == ids
+
+
+def test_ndjson_stream_starts_after_the_cursor(client, register):
+    ids = add_programs(client, register(), 3)
+    cursor = client.get("/programs/", params={"limit": 1}).json()["next_cursor"]
+
+    response = client.get("/programs/", params={"stream": True, "cursor": cursor, "fields": "id"})
+    assert [json.loads(line) for line in response.text.splitlines()] == [{"id": id} for id in ids[1:]]
+    assert client.get("/programs/", params={"stream": True, "cursor": "bad"}).status_code == 400
+
+
+def admin_headers(db, register) -> dict:
+    headers = register("admin@example.com")
+    db.query(models.User).update({"role": "admin"})
+    db.commit()
+    return headers
+
+
+def test_export_csv_and_jsonl_leave_out_passwords(client, db, register):
+    headers = admin_headers(db, register)
+    register("member@example.com")
+
+    rows = list(csv.reader(io.StringIO(client.get("/admin/export/users.csv", headers=headers).text)))
+    assert "password" not in rows[0]
+    assert sorted(row[rows[0].index("email")] for row in rows[1:]) == ["admin@example.com", "member@example.com"]
+
+    response = client.get("/admin/export/users.jsonl", headers=headers)
+    assert response.headers["content-disposition"] == 'attachment; filename="users.jsonl"'
+    users = [json.loads(line) for line in response.text.splitlines()]
+    assert len(users) == 2
+    assert all("password" not in user for user in users)
+
+
+def test_export_gzip(client, db, register):
+    headers = admin_headers(db, register)
+    ids = add_programs(client, headers, 3)
+
+    response = client.get("/admin/export/programs.jsonl", params={"gzip": True}, headers=headers)
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"] == 'attachment; filename="programs.jsonl.gz"'
+    lines = gzip.decompress(response.content).decode("utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ids
+
+
+def test_export_is_admin_only(client, register):
+    assert client.get("/admin/export/users.csv", headers=register()).status_code == 403
@@ -0,0 +1,55 @@
+from blog import models
+
+
+def user_id(db, email="member@example.com") -> int:
+    return db.query(models.User.id).filter(models.User.email == email).scalar()
+
+
+def test_update_user_hashes_the_new_password(client, db, register):
+    headers = register()
+    id = user_id(db)
+
+    response = client.put(f"/user/{id}", headers=headers,
+                          json={"name": "Member", "email": "member@example.com", "password": "newpw"})
+    assert response.status_code == 202
+
+    assert db.get(models.User, id).password.startswith("$2b$")
+    assert client.post("/login", data={"username": "member@example.com", "password": "newpw"}).status_code == 200
+
+
+def test_member_cannot_make_themselves_admin(client, db, register):
+    headers = register()
+    id = user_id(db)
+
+    client.put(f"/user/{id}", headers=headers,
+               json={"name": "Member", "email": "member@example.com", "password": "pw", "role": "admin"})
+
+    assert client.get(f"/user/{id}").json()["role"] == "member"
+    assert client.get("/admin/summary", headers=headers).status_code == 403
+
+
+def test_admin_can_change_a_role(client, db, register):
+    admin_headers = register("admin@example.com")
+    db.query(models.User).update({"role": "admin"})
+    db.commit()
+    register()
+    id = user_id(db)
+
+    client.put(f"/user/{id}", headers=admin_headers,
+               json={"name": "Member", "email": "member@example.com", "password": "pw", "role": "admin"})
+
+    assert client.get(f"/user/{id}").json()["role"] == "admin"
+
+
+def test_member_cannot_update_another_user(client, db, register):
+    register("admin@example.com")
+    db.query(models.User).update({"role": "admin"})
+    db.commit()
+    admin_id = user_id(db, "admin@example.com")
+    headers = register()
+
+    response = client.put(f"/user/{admin_id}", headers=headers,
+                          json={"name": "Admin", "email": "admin@example.com", "password": "taken"})
+    assert response.status_code == 403
+    assert client.post("/login", data={"username": "admin@example.com", "password": "taken"}).status_code != 200
+    assert client.post("/login", data={"username": "admin@example.com", "password": "pw"}).status_code == 200